@@ -0,0 +1,27 @@
+#!/usr/bin/env python
+import timeit
+from types import SimpleNamespace
+from pyconfigmanager.config import Config
+
+NUMBER = 200000
+
+
+def main():
+    config = Config({"db": {"pool": {"size": 4}}})
+    accessor = config.accessor()
+    view = config.namedtuple()
+    plain = SimpleNamespace(db=SimpleNamespace(pool=SimpleNamespace(size=4)))
+    results = [
+        ("config", lambda: config.db.pool.size),
+        ("accessor", lambda: accessor.db.pool.size),
+        ("tuple", lambda: view.db.pool.size),
+        ("plain", lambda: plain.db.pool.size),
+    ]
+    for name, function in results:
+        elapsed = min(timeit.repeat(function, number=NUMBER, repeat=5))
+        print("{:>8}: cfg.db.pool.size {:.0f}ns".format(
+            name, elapsed / NUMBER * 1e9))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+import os
+import tempfile
+import timeit
+from pyconfigmanager.config import Config
+
+GROUPS = 20
+LEAVES = 25
+
+
+def build_schema():
+    schema = {
+        "group{}".format(group): {
+            "leaf{}".format(index): {
+                ".type": ("int", "float", "str", "list", "bool")[index % 5],
+                ".help": "leaf {}".format(index),
+            }
+            for index in range(LEAVES)
+        }
+        for group in range(GROUPS)
+    }
+    schema["config"] = {"file": ""}
+    return schema
+
+
+def parse_commands(schema, subcommands, arguments, lazy):
+    commands = Config(schema)
+    args = commands.argument_parser(
+        subcommands=subcommands, lazy=lazy).parse_args(arguments)
+    commands.update_values_by_arguments(args, subcommands=subcommands)
+
+
+def main():
+    schema = build_schema()
+    config = Config(schema)
+    cold = min(
+        timeit.repeat(
+            lambda: Config(schema).argument_parser(), number=1, repeat=5))
+    warm = min(timeit.repeat(config.argument_parser, number=1, repeat=5))
+    with tempfile.NamedTemporaryFile(
+            "w", suffix=".yaml", delete=False) as stream:
+        stream.write("group0:\n  leaf0: 1\n")
+    arguments = ["--group1-leaf0", "2", "--config-file", stream.name]
+    parse = min(
+        timeit.repeat(
+            lambda: config.update_values_by_argument_parser(
+                arguments=arguments),
+            number=1,
+            repeat=5))
+    single = min(
+        timeit.repeat(
+            lambda: config.update_values_by_argument_parser(
+                arguments=arguments, single_pass=True),
+            number=1,
+            repeat=5))
+    os.remove(stream.name)
+    print("{} arguments: parser cold {:.1f}ms warm {:.1f}ms, "
+          "parse with config file {:.1f}ms single pass {:.1f}ms".format(
+              GROUPS * LEAVES, cold * 1000, warm * 1000, parse * 1000,
+              single * 1000))
+
+    command_schema = {
+        "command": "",
+        **{
+            "command{}".format(index): build_schema()["group0"]
+            for index in range(80)
+        }
+    }
+    subcommands = [name for name in command_schema if name != "command"]
+    arguments = ["command3", "--leaf0", "1"]
+    build = min(
+        timeit.repeat(lambda: Config(command_schema), number=1, repeat=5))
+    print("80 subcommands: build config {:.1f}ms".format(build * 1000))
+    for lazy in (False, True):
+        elapsed = min(
+            timeit.repeat(
+                lambda: parse_commands(command_schema, subcommands,
+                                       arguments, lazy),
+                number=1,
+                repeat=5))
+        print("80 subcommands: build config, parse and apply one, "
+              "lazy={} {:.1f}ms".format(lazy, elapsed * 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+import functools
+import logging
+import timeit
+from pydoc import locate
+from pyconfigmanager.config import Config
+from pyconfigmanager.utils import compile_converter
+
+LEAVES = 50000
+
+
+def legacy_convert_type(value, value_type):
+    if not isinstance(value_type, type):
+        value_type = locate(value_type)
+    if isinstance(value, value_type):
+        return value
+    try:
+        value = value_type(value)
+    except (ValueError, TypeError) as error:
+        logging.warning("convert '{}' to type '{}' failed: {}".format(
+            value, value_type.__name__, error))
+        value = None
+    return value
+
+
+def build(leaves=LEAVES):
+    types = (1, 1.5, "text", True, [1])
+    schema = {}
+    values = {}
+    for index in range(leaves):
+        group = schema.setdefault("group{}".format(index // 100), {})
+        group["leaf{}".format(index)] = types[index % len(types)]
+        values.setdefault("group{}".format(index // 100), {})[
+            "leaf{}".format(index)] = str(index) if index % 5 < 3 else [index]
+    return Config(schema), values
+
+
+def use_legacy_converters(config):
+    for _, group in config.items(raw=True):
+        for _, leaf in group.items(raw=True):
+            object.__setattr__(
+                leaf, "_converter",
+                functools.partial(legacy_convert_type, value_type=leaf.type))
+
+
+def main():
+    logging.disable(logging.WARNING)
+    number = 20000
+    for name, value in (("int", "12"), ("float", "1.5"), ("str", 12)):
+        converter = compile_converter(name)
+        legacy = timeit.timeit(
+            lambda: legacy_convert_type(value, name), number=number)
+        compiled = timeit.timeit(lambda: converter(value), number=number)
+        print("convert {:<6} legacy {:.3f}s compiled {:.3f}s x{:.1f}".format(
+            name, legacy, compiled, legacy / compiled))
+
+    config, values = build()
+    compiled = min(
+        timeit.repeat(lambda: config.update_values(values), number=1,
+                      repeat=3))
+    use_legacy_converters(config)
+    legacy = min(
+        timeit.repeat(lambda: config.update_values(values), number=1,
+                      repeat=3))
+    print("update_values {} leaves legacy {:.3f}s compiled {:.3f}s x{:.1f}".
+          format(LEAVES, legacy, compiled, legacy / compiled))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+#!/usr/bin/env python
+import timeit
+from pyconfigmanager.config import Config
+
+GROUPS = 200
+LEAVES = 50
+
+
+def build_schema():
+    return {
+        "group{}".format(group): {
+            "leaf{}".format(index): index
+            for index in range(LEAVES)
+        }
+        for group in range(GROUPS)
+    }
+
+
+def main():
+    config = Config(build_schema())
+    frozen = config.copy().freeze()
+    values = min(timeit.repeat(config.values, number=10, repeat=5)) / 10
+    cached = min(timeit.repeat(frozen.values, number=10, repeat=5)) / 10
+    print("{} leaves: values() {:.1f}ms frozen {:.4f}ms".format(
+        GROUPS * LEAVES, values * 1000, cached * 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+import gc
+import tracemalloc
+from pyconfigmanager.config import Config
+from pyconfigmanager.options import Options, ArgumentOptions
+
+LEAVES = 40000
+
+
+class LegacyOptions():
+    def __init__(self, names=[], **kwargs):
+        for name in names:
+            super().__setattr__(name, None)
+        for name in kwargs:
+            setattr(self, name, kwargs[name])
+
+    def __setattr__(self, name, value):
+        if not hasattr(self, name):
+            raise AttributeError(name)
+        return super().__setattr__(name, value)
+
+
+def measure(factory, number=LEAVES):
+    gc.collect()
+    tracemalloc.start()
+    items = [factory(index) for index in range(number)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del items
+    return size / number
+
+
+def main():
+    names = list(Options.NAMES)
+    argnames = list(ArgumentOptions.NAMES)
+    rows = (
+        ("Options", lambda index: LegacyOptions(
+            names, type="int", value=index),
+         lambda index: Options(type="int", value=index)),
+        ("ArgumentOptions", lambda index: LegacyOptions(
+            argnames, nargs="*"),
+         lambda index: ArgumentOptions(nargs="*")),
+    )
+    for name, legacy, slots in rows:
+        before = measure(legacy)
+        after = measure(slots)
+        print("{:<16} dict {:.0f} bytes/leaf slots {:.0f} bytes/leaf".format(
+            name, before, after))
+
+    schema = {
+        "group{}".format(group): {
+            "leaf{}".format(index): index
+            for index in range(100)
+        }
+        for group in range(LEAVES // 100)
+    }
+    print("Config with {} leaves: {:.0f} bytes/leaf".format(
+        LEAVES, measure(lambda index: Config(schema), number=1) / LEAVES))
+
+
+if __name__ == "__main__":
+    main()
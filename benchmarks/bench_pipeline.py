@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+import timeit
+from pyconfigmanager import getconfig
+from pyconfigmanager.sources import Pipeline, DictSource
+
+GROUPS = 100
+LEAVES = 50
+
+
+def build_layer(offset):
+    return {
+        "group{}".format(group): {
+            "leaf{}".format(index): index + offset
+            for index in range(LEAVES)
+        }
+        for group in range(GROUPS)
+    }
+
+
+def main():
+    schema = build_layer(0)
+    layers = [build_layer(offset) for offset in range(1, 4)]
+    top = DictSource({"group0": {"leaf0": 0}})
+    pipeline = Pipeline([DictSource(schema, kind="schema")] +
+                        [DictSource(layer) for layer in layers] + [top])
+    pipeline.refresh()
+
+    def change_top():
+        top.update({"group0": {"leaf0": top.data["group0"]["leaf0"] + 1}})
+        return pipeline.refresh()
+
+    full = min(
+        timeit.repeat(
+            lambda: getconfig(schema=schema, values=layers + [top.data]),
+            number=1,
+            repeat=5))
+    incremental = min(timeit.repeat(change_top, number=1, repeat=5))
+    print("{} leaves x {} layers: getconfig {:.1f}ms pipeline top layer "
+          "{:.1f}ms".format(GROUPS * LEAVES, len(layers) + 2, full * 1000,
+                            incremental * 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+#!/usr/bin/env python
+import timeit
+from pyconfigmanager.config import Config, load_snapshot
+
+GROUPS = 200
+LEAVES = 50
+
+
+def build_schema():
+    return {
+        "group{}".format(group): {
+            "leaf{}".format(index): {
+                ".type": ("int", "float", "str", "list")[index % 4],
+                ".value": [index] if index % 4 == 3 else index,
+                ".help": "leaf {}".format(index),
+                "argoptions": {
+                    "metavar": "LEAF"
+                } if index % 5 == 0 else None,
+            }
+            for index in range(LEAVES)
+        }
+        for group in range(GROUPS)
+    }
+
+
+def main():
+    schema = build_schema()
+    config = Config(schema)
+    data = config.dump_snapshot()
+    build = min(timeit.repeat(lambda: Config(schema), number=1, repeat=5))
+    load = min(timeit.repeat(lambda: load_snapshot(data), number=1, repeat=5))
+    print("{} leaves: build {:.1f}ms snapshot {:.1f}ms ({} bytes) x{:.1f}".
+          format(GROUPS * LEAVES, build * 1000, load * 1000, len(data),
+                 build / load))
+
+
+if __name__ == "__main__":
+    main()
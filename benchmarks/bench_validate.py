@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+import timeit
+from pyconfigmanager.config import Config
+
+GROUPS = 300
+LEAVES = 100
+
+
+def build_schema():
+    return {
+        "group{}".format(group): {
+            "leaf{}".format(index): {
+                ".type": ("int", "float", "str")[index % 3],
+                ".value": (index, index + 0.5, str(index))[index % 3],
+                ".min": 0 if index % 3 == 0 else None,
+                ".required": index % 2 == 0,
+            }
+            for index in range(LEAVES)
+        }
+        for group in range(GROUPS)
+    }
+
+
+def main():
+    config = Config(build_schema())
+    schema = config.schema()
+    walk = min(
+        timeit.repeat(
+            lambda: config.validate(schema=schema), number=1, repeat=3))
+    config.validate()
+    plan = min(timeit.repeat(config.validate, number=1, repeat=5))
+    print("{} leaves: schema walk {:.1f}ms plan {:.1f}ms x{:.1f}".format(
+        GROUPS * LEAVES, walk * 1000, plan * 1000, walk / plan))
+
+    config.revalidate()
+    values = {"group0": {"leaf0": 1, "leaf1": 2.5, "leaf2": "x"}}
+
+    def reload():
+        config.update_values(values)
+        return config.revalidate()
+
+    incremental = min(timeit.repeat(reload, number=1, repeat=5))
+    print("{} leaves: revalidate 3 changed leaves {:.3f}ms".format(
+        GROUPS * LEAVES, incremental * 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+import glob
+import os
+import tempfile
+import timeit
+from pyconfigmanager import utils
+
+FILESDIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "pyconfigmanager", "test", "files")
+SCALE = 2000
+
+
+def build(filename):
+    documents = []
+    for item in glob.glob(os.path.join(FILESDIR, "*.yaml")):
+        documents.extend(utils.load_yaml(filenames=item))
+    for item in glob.glob(os.path.join(FILESDIR, "*.json")):
+        documents.extend(utils.load_json(filenames=item))
+    data = {
+        "copy{}".format(index): {
+            "document{}".format(number): document
+            for number, document in enumerate(documents)
+        }
+        for index in range(SCALE)
+    }
+    utils.dump_yaml(data, filename=filename)
+    return data
+
+
+def main():
+    if utils.CSafeLoader is None:
+        print("PyYAML is not built with libyaml")
+        return
+    enabled = utils.YAML_LOADER is utils.CSafeLoader
+    with tempfile.TemporaryDirectory() as tempdir:
+        filename = os.path.join(tempdir, "scaled.yaml")
+        data = build(filename)
+        print("{}: {} bytes".format(filename, os.path.getsize(filename)))
+        for name, enable in (("python", False), ("libyaml", True)):
+            utils.use_libyaml(enable)
+            load = min(
+                timeit.repeat(
+                    lambda: list(utils.load_yaml(filenames=filename)),
+                    number=1,
+                    repeat=3))
+            pick = min(
+                timeit.repeat(
+                    lambda: list(utils.load_yaml(
+                        filenames=filename, pickname="copy7.document0")),
+                    number=1,
+                    repeat=3))
+            dump = min(
+                timeit.repeat(
+                    lambda: utils.dump_yaml(data), number=1, repeat=3))
+            print("{:<8} load {:.3f}s pick {:.3f}s dump {:.3f}s".format(
+                name, load, pick, dump))
+    utils.use_libyaml(enabled)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,34 +1,76 @@
 from pyconfigmanager import utils
-from .config import Config
+from .config import Config, load_snapshot, check_environ_prefix
+from .cache import ConfigCache, getcache
+from .reload import ConfigReloader
+from .shared import SharedConfig
+from .sources import Pipeline
+from . import batch
 import os
 from . import logging
 
 
-def getconfig(schema=[], values=[], **kwargs):
+def getconfig(schema=[],
+              values=[],
+              pickname="",
+              excludes=["schema"],
+              cache=None,
+              freeze=False,
+              environ_prefix=None):
+    if environ_prefix is not None:
+        check_environ_prefix(environ_prefix)
+    cache = getcache(cache)
+
     def normalizedict(data):
         for item in data:
             if isinstance(item, str):
-                for _, entry in enumerate(utils.load_config(item)):
-                    yield entry
+                for _, entry in enumerate(
+                        utils.load_config(
+                            item, pickname=pickname, cache=cache)):
+                    yield utils.pickitems(entry, excludes=excludes)
             else:
-                yield item
+                yield utils.pickitems(
+                    item, pickname=pickname, excludes=excludes)
     if (not isinstance(schema, list)) and (not isinstance(schema, tuple)):
         schema = [schema]
     if (not isinstance(values, list)) and (not isinstance(values, tuple)):
         values = [values]
     config = Config()
     for item in normalizedict(schema):
-        config.update_schema(
-            schema=utils.pickitems(item, **kwargs), merge=True)
+        config.update_schema(schema=item, merge=True)
     for item in normalizedict(values):
-        config.update_values(values=utils.pickitems(item, **kwargs))
+        config.update_values(values=item)
+    if environ_prefix is not None:
+        config.update_values_by_environ(environ_prefix)
+    if freeze:
+        config.freeze()
     return config
 
 
-def loadvalues(filename, pickname="", excludes=[]):
+def validatefiles(schema,
+                  filenames,
+                  pickname="",
+                  excludes=["schema"],
+                  processes=None,
+                  cache=None):
+    if not isinstance(schema, Config):
+        schema = getconfig(
+            schema=schema, pickname=pickname, excludes=excludes, cache=cache)
+    return batch.validate_files(
+        schema,
+        filenames,
+        pickname=pickname,
+        excludes=excludes,
+        processes=processes,
+        cache=cache)
+
+
+def loadvalues(filename, pickname="", excludes=[], cache=None):
     result = {}
-    for _, item in enumerate(utils.load_config(filename=filename)):
-        item = utils.pickitems(item, pickname=pickname, excludes=excludes)
+    for _, item in enumerate(
+            utils.load_config(
+                filename=filename, pickname=pickname,
+                cache=getcache(cache))):
+        item = utils.pickitems(item, excludes=excludes)
         result.update(item)
     return result
 
@@ -37,5 +79,16 @@ DEFAULT_SCHEMA_FILE = os.path.join(
     os.path.dirname(os.path.abspath(__file__)), "schema.yaml")
 
 
-def getschema(filename=[DEFAULT_SCHEMA_FILE], pickname="schema", excludes=[]):
-    return loadvalues(filename=filename, pickname=pickname, excludes=excludes)
+def getschema(filename=[DEFAULT_SCHEMA_FILE],
+              pickname="schema",
+              excludes=[],
+              cache=None):
+    return loadvalues(
+        filename=filename, pickname=pickname, excludes=excludes, cache=cache)
+
+
+def watchconfig(schema=[], values=[], callback=None, **kwargs):
+    reloader = ConfigReloader(schema=schema, values=values, **kwargs)
+    if callback is not None:
+        reloader.subscribe(callback)
+    return reloader.start()
@@ -0,0 +1,76 @@
+from .config import load_snapshot
+from .validation import ValidationReport, Violation
+from .cache import ConfigCache, getcache
+from pyconfigmanager import utils
+import multiprocessing
+
+_worker_state = {}
+
+
+def worker_state(snapshot, pickname, excludes, cache):
+    config = load_snapshot(snapshot)
+    plan = config.validation_plan()
+    plan.revalidate()
+    return {
+        "config": config,
+        "plan": plan,
+        "defaults": {
+            path: (attr, attr.value)
+            for path, (attr, *_) in plan.leaves.items()
+        },
+        "options": (pickname, excludes, getcache(cache)),
+    }
+
+
+def init_worker(snapshot, pickname, excludes, cache):
+    _worker_state.clear()
+    _worker_state.update(worker_state(snapshot, pickname, excludes, cache))
+
+
+def validate_file(filename, state=None):
+    if state is None:
+        state = _worker_state
+    pickname, excludes, cache = state["options"]
+    config = state["config"]
+    plan = state["plan"]
+    report = None
+    try:
+        for entry in utils.load_config(
+                filename, pickname=pickname, cache=cache):
+            config.update_values(utils.pickitems(entry, excludes=excludes))
+    except Exception as error:
+        report = ValidationReport([
+            Violation("", "load", "{}: {}".format(
+                error.__class__.__name__, error))
+        ])
+    written = set(plan.dirty)
+    if report is None:
+        report = plan.revalidate()
+    defaults = state["defaults"]
+    for path in written:
+        attr, value = defaults[path]
+        if attr.value is not value:
+            attr.value = value
+    return filename, report
+
+
+def validate_files(schema,
+                   filenames,
+                   pickname="",
+                   excludes=["schema"],
+                   processes=None,
+                   cache=None,
+                   chunksize=1):
+    if isinstance(cache, ConfigCache):
+        cache = cache.directory
+    initargs = (schema.dump_snapshot(), pickname, excludes, cache)
+    if processes is not None and processes <= 1:
+        state = worker_state(*initargs)
+        for filename in filenames:
+            yield validate_file(filename, state)
+        return
+    with multiprocessing.Pool(
+            processes, initializer=init_worker, initargs=initargs) as pool:
+        for result in pool.imap_unordered(
+                validate_file, filenames, chunksize=chunksize):
+            yield result
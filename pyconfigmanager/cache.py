@@ -0,0 +1,156 @@
+import hashlib
+import os
+import pickle
+import stat
+import tempfile
+import time
+from . import utils
+from . import errors
+
+
+def default_directory():
+    directory = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache")
+    return os.path.join(directory, "pyconfigmanager")
+
+
+class ConfigCache():
+    VERSION = 3
+    SUFFIX = ".cache"
+    RACY_WINDOW = 2 * 10**9
+
+    def __init__(self,
+                 directory=None,
+                 max_size=64 * 1024 * 1024,
+                 max_age=7 * 24 * 60 * 60):
+        self.directory = os.path.abspath(
+            os.path.expanduser(directory or default_directory()))
+        self.max_size = max_size
+        self.max_age = max_age
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        check_directory(self.directory)
+
+    def entry(self, filename, pickname=None):
+        key = "{}\0{}\0{}\0{}".format(self.VERSION, filename,
+                                      ".".join(utils.picknames(pickname)),
+                                      utils.YAML_LOADER.__name__)
+        return os.path.join(
+            self.directory,
+            hashlib.sha1(key.encode("utf-8")).hexdigest() + self.SUFFIX)
+
+    def load(self, filename, pickname=None):
+        filename = os.path.abspath(
+            os.path.expanduser(os.path.expandvars(filename)))
+        checked = time.time_ns()
+        info = os.stat(filename)
+        stamp = (info.st_size, info.st_mtime_ns)
+        entry = self.entry(filename, pickname)
+        cached = self.read(entry)
+        if (cached and cached[0] == stamp
+                and stamp[1] < cached[1] - self.RACY_WINDOW):
+            return cached[3]
+
+        digest = file_digest(filename)
+        if cached and cached[2] == digest:
+            documents = cached[3]
+            if cached[0] == stamp and stamp[1] >= checked - self.RACY_WINDOW:
+                return documents
+        else:
+            documents = self.parse(filename, pickname)
+        self.write(entry, (stamp, checked, digest, documents))
+        return documents
+
+    def parse(self, filename, pickname=None):
+        return list(utils.load_config(filename, pickname=pickname))
+
+    def read(self, entry):
+        try:
+            with open(entry, "rb") as stream:
+                return pickle.load(stream)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            self.remove(entry)
+            return None
+
+    def write(self, entry, data):
+        descriptor, tempname = tempfile.mkstemp(
+            dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as stream:
+                pickle.dump(data, stream, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tempname, entry)
+        except BaseException:
+            self.remove(tempname)
+            raise
+        self.evict()
+
+    def entries(self):
+        result = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(self.SUFFIX):
+                continue
+            entry = os.path.join(self.directory, name)
+            try:
+                info = os.stat(entry)
+            except FileNotFoundError:
+                continue
+            result.append((info.st_mtime, info.st_size, entry))
+        return sorted(result)
+
+    def evict(self):
+        entries = self.entries()
+        if self.max_age is not None:
+            deadline = time.time() - self.max_age
+            for mtime, _, entry in entries:
+                if mtime < deadline:
+                    self.remove(entry)
+            entries = [item for item in entries if item[0] >= deadline]
+        if self.max_size is not None:
+            size = sum(item[1] for item in entries)
+            for _, entry_size, entry in entries:
+                if size <= self.max_size:
+                    break
+                self.remove(entry)
+                size -= entry_size
+
+    def clear(self):
+        for _, _, entry in self.entries():
+            self.remove(entry)
+
+    def remove(self, entry):
+        try:
+            os.remove(entry)
+        except FileNotFoundError:
+            pass
+
+
+def file_digest(filename):
+    digest = hashlib.sha256()
+    with open(filename, "rb") as stream:
+        for chunk in iter(lambda: stream.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def check_directory(directory):
+    info = os.lstat(directory)
+    if not stat.S_ISDIR(info.st_mode):
+        raise errors.ConfigError(
+            "cache directory '{}' is not a directory".format(directory))
+    if not hasattr(os, "getuid"):
+        return
+    if info.st_uid != os.getuid():
+        raise errors.ConfigError(
+            "cache directory '{}' is not owned by the current user".format(
+                directory))
+    if info.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        raise errors.ConfigError(
+            "cache directory '{}' is writable by other users".format(
+                directory))
+
+
+def getcache(cache):
+    if cache is None or isinstance(cache, ConfigCache):
+        return cache
+    return ConfigCache(directory=cache)
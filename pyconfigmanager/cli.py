@@ -0,0 +1,198 @@
+from pyconfigmanager import getconfig, validatefiles, utils
+from .options import Options, ArgumentOptions
+from .cache import getcache
+import argparse
+import json
+import sys
+
+
+def argument_parser():
+    parser = argparse.ArgumentParser(prog="pyconfigmanager")
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.required = True
+
+    def add_parser(name, help):
+        subparser = subparsers.add_parser(name, help=help)
+        subparser.add_argument(
+            "-s",
+            "--schema",
+            action="append",
+            default=[],
+            required=True,
+            help="schema file, may be given multiple times")
+        subparser.add_argument(
+            "-p", "--pickname", default="", help="pick values under name")
+        subparser.add_argument(
+            "--excludes",
+            nargs="*",
+            default=["schema"],
+            help="top level names to ignore in the files")
+        subparser.add_argument("--cache", help="parsed file cache directory")
+        return subparser
+
+    subparser = add_parser("validate", "validate value files")
+    subparser.add_argument("filenames", nargs="*", help="value files")
+    subparser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="worker processes, 0 for one per core")
+    subparser.add_argument(
+        "--format", choices=["text", "json"], default="text")
+
+    subparser = add_parser("dump", "dump the merged values")
+    subparser.add_argument("filenames", nargs="*", help="value files")
+    subparser.add_argument("-o", "--output", help="output file")
+    subparser.add_argument(
+        "--format", choices=["yaml", "json"], default="yaml")
+
+    subparser = add_parser("diff", "compare the values of two value files")
+    subparser.add_argument("first", help="value file")
+    subparser.add_argument("second", help="value file")
+    subparser.add_argument(
+        "--format", choices=["text", "json"], default="text")
+
+    subparser = add_parser("explain", "explain a config path")
+    subparser.add_argument("path", help="dotted config path")
+    subparser.add_argument("filenames", nargs="*", help="value files")
+    subparser.add_argument(
+        "--format", choices=["text", "json"], default="text")
+    return parser
+
+
+def build(args, values=[]):
+    return getconfig(
+        schema=args.schema,
+        values=values,
+        pickname=args.pickname,
+        excludes=args.excludes,
+        cache=args.cache)
+
+
+def validate(args, output):
+    schema = build(args)
+    if not args.filenames:
+        results = [("", schema.validate())]
+    else:
+        results = validatefiles(
+            schema,
+            args.filenames,
+            pickname=args.pickname,
+            excludes=args.excludes,
+            processes=args.jobs or None,
+            cache=args.cache)
+    status = 0
+    items = []
+    for filename, report in results:
+        if not report.isvalid():
+            status = 1
+        if args.format == "json":
+            items.append({
+                "filename": filename,
+                "valid": report.isvalid(),
+                "violations": report.values(),
+            })
+            continue
+        if report.isvalid():
+            output.write("{}: ok\n".format(filename or "schema"))
+        for message in report.messages():
+            output.write("{}: {}\n".format(filename or "schema", message))
+    if args.format == "json":
+        output.write(json.dumps(items, ensure_ascii=False, indent=2) + "\n")
+    return status
+
+
+def dump(args, output):
+    values = build(args, args.filenames).values()
+    if args.format == "json":
+        content = utils.dump_json(values, filename=args.output)
+    else:
+        content = utils.dump_yaml(
+            values, filename=args.output).decode("utf-8")
+    if not args.output:
+        output.write(content.rstrip("\n") + "\n")
+    return 0
+
+
+def leaves(config):
+    return {
+        path: attr.value
+        for path, attr in config.path_index().items()
+        if isinstance(attr, Options)
+    }
+
+
+def diff(args, output):
+    first = leaves(build(args, [args.first]))
+    second = leaves(build(args, [args.second]))
+    changes = []
+    for path in list(first) + [path for path in second if path not in first]:
+        old, new = first.get(path), second.get(path)
+        if type(old) is not type(new) or old != new:
+            changes.append({"path": path, "first": old, "second": new})
+    if args.format == "json":
+        output.write(
+            json.dumps(changes, ensure_ascii=False, indent=2, default=str) +
+            "\n")
+    else:
+        for change in changes:
+            output.write("{}: {!r} -> {!r}\n".format(
+                change["path"], change["first"], change["second"]))
+    return 1 if changes else 0
+
+
+def explain(args, output):
+    config = build(args, args.filenames)
+    try:
+        attr = config.getitem(args.path, raw=True)
+    except KeyError:
+        output.write("{}: no such path\n".format(args.path))
+        return 1
+    source = "schema"
+    cache = getcache(args.cache)
+    for filename in args.filenames:
+        for entry in utils.load_config(
+                filename, pickname=args.pickname, cache=cache):
+            entry = utils.pickitems(entry, excludes=args.excludes)
+            if has_path(entry, args.path.split(".")):
+                source = filename
+    result = {"path": args.path, "source": source}
+    if isinstance(attr, Options):
+        result.update(attr.values())
+        if isinstance(attr.argoptions, ArgumentOptions):
+            result["argoptions"] = attr.argoptions.values()
+        if attr.argoptions is not False:
+            result["argument"] = "--" + args.path.replace(".", "-")
+    else:
+        result["children"] = list(attr)
+    if args.format == "json":
+        output.write(
+            json.dumps(result, ensure_ascii=False, indent=2, default=str) +
+            "\n")
+    else:
+        for key, value in result.items():
+            if value is not None:
+                output.write("{}: {}\n".format(key, value))
+    return 0
+
+
+def has_path(values, names):
+    for name in names:
+        if not isinstance(values, dict) or name not in values:
+            return False
+        values = values[name]
+    return True
+
+
+COMMANDS = {
+    "validate": validate,
+    "dump": dump,
+    "diff": diff,
+    "explain": explain,
+}
+
+
+def main(argv=None, output=None):
+    args = argument_parser().parse_args(argv)
+    return COMMANDS[args.command](args, output or sys.stdout)
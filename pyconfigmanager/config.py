@@ -1,59 +1,86 @@
-from .options import Options
+from .options import Options, ArgumentOptions, restore_options
+from .options import str2bool, thaw_value
+from .views import build_accessor, build_namedtuple
+from .validation import ValidationPlan, ValidationReport, Violation
 from pyconfigmanager import utils
 import logging
 from .logging import get_logging_level
 import argparse
+import collections.abc
+import functools
+import os
+import pickle
 import sys
+import types
+import yaml
 from . import errors
 
+SNAPSHOT_MAGIC = b"PCMS"
+SNAPSHOT_VERSION = 1
+
+PRIVATE_DEFAULTS = (
+    ("_parent", None),
+    ("_version", 0),
+    ("_index", None),
+    ("_tracker", None),
+    ("_accessor", None),
+    ("_plan", None),
+    ("_environ", None),
+)
+
+
+def init_private(config):
+    for name, value in PRIVATE_DEFAULTS:
+        object.__setattr__(config, name, value)
+
+
+def structure_changed(config):
+    while config is not None:
+        object.__setattr__(config, "_version",
+                           object.__getattribute__(config, "_version") + 1)
+        config = object.__getattribute__(config, "_parent")
+
+
+def structure_version(config):
+    return object.__getattribute__(config, "_version")
+
 
 class Config():
     ATTR_INDICATOR = "."
 
     def __init__(self, schema={}):
-        for name in ("type", "value", "required",
-                     "min", "max", "help", "argoptions",
-                     "subitems"):
-            super().__setattr__(name, None)
         super().__setattr__("subitems", {})
-        if not isinstance(schema, dict):
+        init_private(self)
+        if not isinstance(schema, collections.abc.Mapping):
             raise ValueError("schema('{}') must be instance of dict".format(
                 utils.typename(type(schema))))
         self.update_schema(schema=schema, merge=False)
 
     def __new__(self, schema={}):
-        if isinstance(schema, Options):
-            schema = vars(schema)
-        elif isinstance(schema, dict):
-            if any([
-                    True if key[:1] == Config.ATTR_INDICATOR else False
-                    for key in schema
-            ]):
-                schema = {(key[1:]
-                           if key[:1] == Config.ATTR_INDICATOR else key):
-                          value
-                          for key, value in schema.items()}
-            else:
-                return super(Config, self).__new__(self)
-        else:
-            schema = {"value": schema}
-        if (("value" in schema) and (schema["value"] is not None)):
-            if (("type" not in schema) or (schema["type"] is None)):
-                schema["type"] = utils.typename(type(schema["value"]))
-        return Options(**schema)
+        values = options_values(schema)
+        if values is None:
+            return super(Config, self).__new__(self)
+        return Options(**values)
 
     def __iter__(self):
-        for name in self.__dict__:
+        for name in super().__getattribute__("subitems"):
             yield name
 
+    def __contains__(self, name):
+        return name in super().__getattribute__("subitems")
+
     def __repr__(self):
         return str(self.values())
 
+    def __reduce__(self):
+        return (restore_config, (super().__getattribute__("subitems"),
+                                 isinstance(self, FrozenConfig)))
+
     def __getitem__(self, name):
-        return self.getattr(name, raw=False)
+        return self.getitem(name, raw=False)
 
     def __setitem__(self, name, value):
-        return setattr(self, name, value)
+        return self.setitem(name, value, raw=True)
 
     def __delitem__(self, name):
         return delattr(self, name)
@@ -62,48 +89,151 @@ class Config():
         return super().__getattribute__("getattr")(name, raw=False)
 
     def __setattr__(self, name, value):
-        return super().__setattr__(name, value)
+        return self.setattr(name, value, raw=False)
+
+    def __delattr__(self, name):
+        subitems = super().__getattribute__("subitems")
+        if name not in subitems:
+            raise AttributeError("'{}' object has no attribute '{}'".format(
+                type(self).__name__, name))
+        attr = subitems.pop(name)
+        if (isinstance(attr, Config)
+                and object.__getattribute__(attr, "_parent") is self):
+            object.__setattr__(attr, "_parent", None)
+        structure_changed(self)
 
     def isleaf(self):
         return len(super().__getattribute__("subitems")) == 0
 
     def getitem(self, name, raw=False):
         if not name:
-            return self.getattr("value")
+            return self
         if isinstance(name, str):
-            names = [name]
+            if Config.ATTR_INDICATOR in name:
+                attr = self.path_index().get(name)
+                if attr is None:
+                    raise KeyError(name)
+            else:
+                attr = super().__getattribute__("subitems")[name]
         else:
-            names = name
-        attr = self
-        for name in names:
-            attr = attr.getattr("subitems")[name]
-        if (not raw) and attr.isleaf():
-            return attr.getattr("value")
+            attr = self
+            for item in name:
+                attr = attr.getattr("subitems")[item]
+        if (not raw) and isinstance(attr, Options):
+            return attr.value
         return attr
 
     def setitem(self, name, value, raw=False):
         if not name:
-            return self.setattr("value", value)
+            raise errors.ConfigError("setitem with no name specified")
         if isinstance(name, str):
-            names = [name]
-        else:
-            names = name
+            if name in self or Config.ATTR_INDICATOR not in name:
+                return self.setattr(name, value, raw=raw)
+            parentname, _, name = name.rpartition(Config.ATTR_INDICATOR)
+            attr = self.getitem(parentname, raw=True)
+            if not isinstance(attr, Config):
+                raise KeyError(parentname)
+            return attr.setattr(name, value, raw=raw)
         attr = self
-        for name in names:
-            attr = attr.getattr("subitems")[name]
+        for item in name[:-1]:
+            attr = attr.getattr("subitems")[item]
+        return attr.setattr(name[-1], value, raw=raw)
 
-    def getattr(self, name):
+    def path_index(self):
+        return self.indexes()[1]
+
+    def argument_index(self, ignores=()):
+        index = self.indexes()
+        key = tuple(sorted(ignores))
+        dests = index[2].get(key)
+        if dests is None:
+            dests = {}
+            nodes = [((), self)]
+            while nodes:
+                children = []
+                for names, node in nodes:
+                    for name, attr in super(Config, node).__getattribute__(
+                            "subitems").items():
+                        if not names and name in ignores:
+                            continue
+                        path = names + (name, )
+                        if isinstance(attr, Config):
+                            children.append((path, attr))
+                        elif isinstance(attr, Options):
+                            dest = "_".join(path)
+                            if dest not in dests:
+                                dests[dest] = self.locate_argument(
+                                    dest.split("_"))
+                nodes = children
+            dests = {
+                dest: attr
+                for dest, attr in dests.items() if attr is not None
+            }
+            index[2][key] = dests
+        return dests
+
+    def indexes(self):
+        index = super().__getattribute__("_index")
+        version = structure_version(self)
+        if index is not None and index[0] == version:
+            return index
+        paths = {}
+        nodes = [((), self)]
+        while nodes:
+            children = []
+            for names, node in nodes:
+                for name, attr in super(
+                        Config, node).__getattribute__("subitems").items():
+                    path = names + (name, )
+                    paths.setdefault(Config.ATTR_INDICATOR.join(path), attr)
+                    if isinstance(attr, Config):
+                        children.append((path, attr))
+            nodes = children
+        index = (version, paths, {})
+        super().__setattr__("_index", index)
+        return index
+
+    def accessor(self):
+        accessor = super().__getattribute__("_accessor")
+        version = structure_version(self)
+        if accessor is not None and (accessor[0] == version
+                                     or isinstance(self, FrozenConfig)):
+            return accessor[1]
+        accessor = (version, build_accessor(self))
+        super().__setattr__("_accessor", accessor)
+        return accessor[1]
+
+    def namedtuple(self):
+        return build_namedtuple(self)
+
+    def getattr(self, name, raw=False):
+        if isinstance(name, list) or isinstance(name, tuple):
+            if len(name) == 1:
+                name = name[0]
+            elif len(name) == 0:
+                raise errors.ConfigError("getattr with no name specified")
+            else:
+                return self.getattr(
+                    name[0], raw=True).getattr(
+                        name[1:], raw=raw)
+        subitems = super().__getattribute__("subitems")
+        if name in subitems:
+            attr = subitems[name]
+            if (not raw) and isinstance(attr, Options):
+                return attr.value
+            return attr
         return super().__getattribute__(name)
 
-    def setattr(self, name, value):
-        return super().__setattr__(name, value)
+    def setattr(self, name, value, raw=False):
         if isinstance(name, list) or isinstance(name, tuple):
             if len(name) == 1:
                 name = name[0]
             elif len(name) == 0:
                 raise errors.ConfigError("setattr with no name specified")
             else:
-                return self.getattr(name, raw=raw, option=option)
+                return self.getattr(
+                    name[:-1], raw=True).setattr(
+                        name[-1], value, raw=raw)
         if not raw:
             attr = self.getattr(name, raw=True)
             if (isinstance(attr, Options)):
@@ -118,7 +248,21 @@ class Config():
                 attr_value = value
             else:
                 attr_value = Config(value)
-            return super().__setattr__(name, attr_value)
+            subitems = super().__getattribute__("subitems")
+            attr = subitems.get(name)
+            if attr is attr_value:
+                return
+            if isinstance(attr_value, Config):
+                if object.__getattribute__(attr_value, "_parent") is not None:
+                    raise errors.ConfigError(
+                        "'{}' is already attached to a config, {}".format(
+                            name, "attach a copy() of it instead"))
+                object.__setattr__(attr_value, "_parent", self)
+            if (isinstance(attr, Config)
+                    and object.__getattribute__(attr, "_parent") is self):
+                object.__setattr__(attr, "_parent", None)
+            subitems[name] = attr_value
+            structure_changed(self)
 
     def items(self, raw=False):
         result = []
@@ -140,7 +284,7 @@ class Config():
 
     def schema(self, name=None):
         if name is None:
-            name = list(self.__dict__.keys())
+            name = list(self)
         if isinstance(name, list):
             result = {}
             for name_item in name:
@@ -150,42 +294,65 @@ class Config():
         if isinstance(attr, Options):
             return {
                 "{}{}".format(Config.ATTR_INDICATOR, key): value
-                for key, value in vars(attr).items()
+                for key, value in attr.values().items()
             }
         elif isinstance(attr, Config):
             return attr.schema()
 
-    def update_schema(self, schema={}, merge=True):
+    def update_schema(self, schema={}, merge=True, parentnames=[]):
+        changes = []
         if schema is None:
             if not merge:
-                for name in [name for name, _ in self.items()]:
+                for name in [name for name in self]:
                     del self[name]
-            return
+                    changes.append(
+                        Config.ATTR_INDICATOR.join(parentnames + [name]))
+            return changes
+        subitems = super().__getattribute__("subitems")
         for name in schema:
-            if not merge:
-                self.setattr(name, schema[name], raw=True)
+            value = schema[name]
+            if merge and value is None:
                 continue
-            if schema[name] is None:
-                continue
-            if name not in self:
-                self.setattr(name, schema[name], raw=True)
-            attr = self.getattr(name, raw=True)
-            init_attr = Config.__new__(Config, schema[name])
-            if isinstance(attr, Options) and isinstance(init_attr, Options):
-                attr.update_values(values=vars(init_attr), merge=merge)
-            elif isinstance(attr, Options) and isinstance(init_attr, Config):
-                self.setattr(name, schema[name], raw=True)
-            elif isinstance(attr, Config) and isinstance(init_attr, Options):
-                self.setattr(name, schema[name], raw=True)
-            elif isinstance(attr, Config) and isinstance(init_attr, Config):
-                attr.update_schema(schema[name], merge=merge)
-            else:
-                self.setattr(name, schema[name], raw=True)
+            attr = subitems.get(name)
+            if merge and attr is not None:
+                values = options_values(value)
+                if isinstance(attr, Options) and values is not None:
+                    if attr.merge_values(values):
+                        changes.append(
+                            Config.ATTR_INDICATOR.join(parentnames + [name]))
+                    continue
+                elif isinstance(attr, Config) and values is None:
+                    changes.extend(
+                        attr.update_schema(
+                            value, merge=merge,
+                            parentnames=parentnames + [name]))
+                    continue
+            self.setattr(name, value, raw=True)
+            changes.append(Config.ATTR_INDICATOR.join(parentnames + [name]))
+        return changes
+
+    def validation_plan(self):
+        plan = super().__getattribute__("_plan")
+        version = structure_version(self)
+        if plan is not None and ((plan.version == version and not plan.stale)
+                                 or isinstance(self, FrozenConfig)):
+            return plan
+        fresh = ValidationPlan(self, version)
+        if plan is not None:
+            fresh.inherit(plan)
+        super().__setattr__("_plan", fresh)
+        return fresh
 
-    def assert_values(self, schema=None, name=""):
+    def revalidate(self):
+        return self.validation_plan().revalidate()
+
+    def validate(self, schema=None):
         if not schema:
-            schema = self.schema()
+            return self.validation_plan().run()
+        return ValidationReport(self.schema_violations(schema))
 
+    def schema_violations(self, schema, name=""):
+        violations = []
         for attr_name in schema:
             if not schema[attr_name]:
                 continue
@@ -193,25 +360,44 @@ class Config():
                 show_name = "{}.{}".format(name, attr_name)
             else:
                 show_name = attr_name
-            assert hasattr(self, attr_name), (
-                "'Config' object has no attribute '{}'".format(show_name))
+            if attr_name not in self:
+                violations.append(
+                    Violation(show_name, "missing",
+                              "'Config' object has no attribute '{}'".format(
+                                  show_name)))
+                continue
             attr = self.getattr(attr_name, raw=True)
-            if isinstance(schema[attr_name], dict):
+            if isinstance(schema[attr_name], collections.abc.Mapping):
                 check_attr = Config.__new__(Config, schema[attr_name])
-                assert isinstance(attr, type(check_attr)), (
-                    "attribute '{}' is not instance of '{}'".format(
-                        show_name, utils.typename((type(check_attr)))))
+                if not isinstance(attr, type(check_attr)):
+                    violations.append(
+                        Violation(show_name, "schema",
+                                  "attribute '{}' is not instance of '{}'".
+                                  format(show_name,
+                                         utils.typename(type(check_attr)))))
+                    continue
             elif schema[attr_name] is True:
                 check_attr = None
             else:
                 check_attr = {}
 
             if isinstance(attr, Config):
-                if check_attr:
-                    attr.assert_values(
-                        schema=schema[attr_name], name=show_name)
+                if isinstance(check_attr, Config):
+                    violations.extend(
+                        attr.schema_violations(
+                            schema=schema[attr_name], name=show_name))
             else:
-                attr.assert_value(options=check_attr)
+                violations.extend(
+                    Violation(show_name, kind, message)
+                    for kind, message in attr.violations(options=check_attr))
+        return violations
+
+    def assert_values(self, schema=None, name="", incremental=False):
+        if not schema:
+            report = self.revalidate() if incremental else self.validate()
+        else:
+            report = ValidationReport(self.schema_violations(schema, name))
+        report.check()
 
     def logging_values(self, schema=None, verbosity="INFO", name=""):
         if not schema:
@@ -254,15 +440,29 @@ class Config():
                         ignores=(),
                         command_attrname="command",
                         parentnames=[],
-                        argprefix="",):
+                        argprefix="",
+                        lazy=True,
+                        dests=None,
+                        shadows=()):
         subcommands = normalize_subcommands(subcommands)
+        if dests is None:
+            dests = {}
+        populates = []
         if not parser:
-            parser = argparse.ArgumentParser(
+            parser_class = LazyArgumentParser if (
+                lazy and subcommands) else argparse.ArgumentParser
+            parser = parser_class(
                 formatter_class=argparse.ArgumentDefaultsHelpFormatter,
                 description="")
         if subcommands:
             subparsers = parser.add_subparsers(
-                title="subcommands", help="subcommands", dest=command_attrname)
+                title="subcommands",
+                help="subcommands",
+                dest=command_attrname,
+                parser_class=LazyArgumentParser
+                if lazy else argparse.ArgumentParser)
+            if isinstance(parser, LazyArgumentParser):
+                parser.commands = subparsers.choices
         else:
             subcommands = {}
             subparsers = None
@@ -273,69 +473,113 @@ class Config():
             if attr_name in ignores:
                 continue
             if attr_name in subcommands:
+                populate = functools.partial(
+                    attr.argument_parser,
+                    subcommands=subcommands[attr_name],
+                    parentnames=parentnames + [attr_name],
+                    lazy=lazy,
+                    shadows=shadows + (dests, ))
+                options = {"populate": populate} if lazy else {}
                 subparser = subparsers.add_parser(
                     attr_name,
                     formatter_class=argparse.ArgumentDefaultsHelpFormatter,
                     description=attr_name,
-                    help=attr_name)
+                    help=attr_name,
+                    **options)
                 arg_name = "".join(
                     ["{}.".format(name) for name in parentnames])
                 arg_name += attr_name
                 subparser.set_defaults(
                     **{command_attrname: arg_name})
-                self.getattr(
-                    attr_name, raw=True).argument_parser(
-                        parser=subparser,
-                        subcommands=subcommands[attr_name],
-                        parentnames=parentnames + [attr_name])
+                if not lazy:
+                    populates.append((populate, subparser))
                 continue
 
             arg_name = attr_name if not argprefix else "{}-{}".format(
                 argprefix, attr_name)
             if isinstance(attr, Config):
-                attr.argument_parser(parser=parser, argprefix=arg_name)
+                attr.argument_parser(
+                    parser=parser,
+                    argprefix=arg_name,
+                    dests=dests,
+                    shadows=shadows)
             elif isinstance(attr, Options):
                 if attr.argoptions is False:
                     continue
                 options = attr.argument_options()
                 if "dest" in options:
                     del options["dest"]
-                parser.add_argument(
-                    "--" + arg_name,
-                    dest=arg_name.replace("-", "_"),
-                    **options)
+                dest = arg_name.replace("-", "_")
+                for known in shadows + (dests, ):
+                    if known.get(dest, "--" + arg_name) != "--" + arg_name:
+                        raise errors.ConfigError(
+                            "argument '--{}' has the same dest as '{}'".format(
+                                arg_name, known[dest]))
+                dests[dest] = "--" + arg_name
+                parser.add_argument("--" + arg_name, dest=dest, **options)
+        for populate, subparser in populates:
+            populate(parser=subparser)
         return parser
 
+    def update_argument_defaults(self,
+                                 parser,
+                                 subcommands=(),
+                                 command_attrname="command",
+                                 argprefix=""):
+        subcommands = normalize_subcommands(subcommands)
+        subparsers = {}
+        if subcommands:
+            for action in parser._actions:
+                if isinstance(action, argparse._SubParsersAction):
+                    subparsers.update(action.choices)
+        defaults = {}
+        for attr_name, attr in self.items(raw=True):
+            if attr_name == command_attrname:
+                continue
+            if attr_name in subcommands:
+                if attr_name in subparsers:
+                    attr.update_argument_defaults(
+                        subparsers[attr_name],
+                        subcommands=subcommands[attr_name])
+                continue
+            arg_name = attr_name if not argprefix else "{}-{}".format(
+                argprefix, attr_name)
+            if isinstance(attr, Config):
+                attr.update_argument_defaults(parser, argprefix=arg_name)
+            elif isinstance(attr, Options) and attr.argoptions is not False:
+                defaults[arg_name.replace("-", "_")] = (
+                    attr.argument_options().get("default"))
+        parser.set_defaults(**defaults)
+        return parser
+
+    def locate_argument(self, names):
+        test_name = ""
+        match_name = None
+        match_index = 0
+        for index, item in enumerate(names):
+            test_name = "{}_{}".format(test_name, item) if test_name else item
+            if test_name in self:
+                match_name = test_name
+                match_index = index
+
+        if match_name:
+            attr = self.getattr(match_name, raw=True)
+            if isinstance(attr, Options):
+                if match_index == len(names) - 1:
+                    return attr
+            elif isinstance(attr, Config):
+                if match_index < len(names) - 1:
+                    return attr.locate_argument(names[match_index + 1:])
+        return None
+
     def update_value_by_argument(self, argname, value, ignore_not_found=True):
         if isinstance(argname, str):
-            names = argname.split("_")
+            attr = self.argument_index().get(argname)
         else:
-            names = argname
-        names = [name for name in names]
-        if len(names) > 0:
-            test_name = ""
-            match_name = None
-            match_index = 0
-            for index, item in enumerate(names):
-                test_name = "{}_{}".format(test_name,
-                                           item) if test_name else item
-                if test_name in self:
-                    match_name = test_name
-                    match_index = index
-
-            if match_name:
-                attr = self.getattr(match_name, raw=True)
-                if isinstance(attr, Options):
-                    if match_index == len(names) - 1:
-                        self.setattr(match_name, value)
-                        return
-                elif isinstance(attr, Config):
-                    if match_index < len(names) - 1:
-                        attr.update_value_by_argument(
-                            names[match_index + 1:],
-                            value,
-                            ignore_not_found=ignore_not_found)
-                        return
+            attr = self.locate_argument([name for name in argname])
+        if attr is not None:
+            attr.value = value
+            return
         if not ignore_not_found:
             raise AttributeError(
                 "attr not found by argname '{}'".format(argname))
@@ -349,34 +593,36 @@ class Config():
         if not isinstance(args, dict):
             args = vars(args)
 
+        levels = [(self, subcommands)]
         if (subcommands and (command_attrname in args) and
                 args[command_attrname]):
             command_names = [
                 name for name in args[command_attrname].split(".") if name]
-            subconfigs = [self]
             for name in command_names:
                 if name not in subcommands:
-                    subconfigs = []
+                    levels = levels[:1]
                     break
-                subconfigs.append(subconfigs[-1].getattr(name, raw=True))
-                subcommands = subcommands[name]
-            subconfigs = subconfigs[1:]
-        else:
-            subconfigs = []
-        subconfigs.reverse()
+                subcommands = normalize_subcommands(subcommands[name])
+                levels.append(
+                    (levels[-1][0].getattr(name, raw=True), subcommands))
+        levels.reverse()
+        indexes = [
+            config.argument_index(ignores=tuple(nested))
+            for config, nested in levels
+        ]
+        ignore_not_found = kwargs.get("ignore_not_found", True)
         for arg_name in args:
-            argfound = False
-            for index, subconfig in enumerate(subconfigs):
-                try:
-                    subconfig.update_value_by_argument(
-                        arg_name, args[arg_name], ignore_not_found=False)
-                    argfound = True
+            for index in indexes:
+                attr = index.get(arg_name)
+                if attr is not None:
                     break
-                except AttributeError:
-                    argfound = False
-            if argfound:
-                continue
-            self.update_value_by_argument(arg_name, args[arg_name], **kwargs)
+            else:
+                attr = self.argument_index().get(arg_name)
+            if attr is not None:
+                attr.value = args[arg_name]
+            elif not ignore_not_found:
+                raise AttributeError(
+                    "attr not found by argname '{}'".format(arg_name))
 
     def update_values_by_argument_parser(self,
                                          parser=None,
@@ -384,33 +630,94 @@ class Config():
                                          subcommands=(),
                                          valuefile_config="config.file",
                                          valuefile_pickname="",
-                                         valuefile_excludes=[]):
+                                         valuefile_excludes=[],
+                                         single_pass=False,
+                                         environ_prefix=None):
+        if environ_prefix is not None:
+            check_environ_prefix(environ_prefix)
+        if single_pass:
+            if arguments is None:
+                arguments = sys.argv[1:]
+            filename = None
+            if valuefile_config:
+                filename = scan_argument(
+                    arguments, "--" + valuefile_config.replace(
+                        Config.ATTR_INDICATOR, "-"))
+                if filename is None:
+                    filename = self.getitem(valuefile_config, raw=False)
+            if filename:
+                for values in utils.load_config(
+                        filename=filename, pickname=valuefile_pickname):
+                    self.update_values(
+                        utils.pickitems(values, excludes=valuefile_excludes))
+            if environ_prefix is not None:
+                self.update_values_by_environ(environ_prefix)
+            parser = self.argument_parser(
+                parser=parser, subcommands=subcommands)
+            parser.allow_abbrev = False
+            args = parser.parse_args(arguments)
+            self.update_values_by_arguments(args, subcommands=subcommands)
+            return args
         parser = self.argument_parser(parser=parser, subcommands=subcommands)
         args = parser.parse_args(arguments)
         # update values to get prog config filename
         self.update_values_by_arguments(args, subcommands=subcommands)
-        if not valuefile_config:
-            return args
-        valuefile_config = list(filter(str, valuefile_config.split(".")))
-        attr = self.getattr(valuefile_config, raw=False)
-        if not attr:
+        attr = None
+        if valuefile_config:
+            attr = self.getitem(valuefile_config, raw=False)
+        if not attr and environ_prefix is None:
             return args
-        for values in utils.load_config(filename=attr):
-            self.update_values(utils.pickitems(
-                values,
-                pickname=valuefile_pickname,
-                excludes=valuefile_excludes))
+        if attr:
+            for values in utils.load_config(
+                    filename=attr, pickname=valuefile_pickname):
+                self.update_values(
+                    utils.pickitems(values, excludes=valuefile_excludes))
+        if environ_prefix is not None:
+            self.update_values_by_environ(environ_prefix)
         # force args overrides prog_config
-        parser = self.argument_parser(subcommands=subcommands,)
+        self.update_argument_defaults(parser, subcommands=subcommands)
         args = parser.parse_args(arguments)
         self.update_values_by_arguments(args, subcommands=subcommands)
         return args
 
+    def environ_index(self, prefix):
+        check_environ_prefix(prefix)
+        environ = super().__getattribute__("_environ")
+        version = structure_version(self)
+        if environ is None or environ[0] != version:
+            environ = (version, {})
+            super().__setattr__("_environ", environ)
+        index = environ[1].get(prefix)
+        if index is None:
+            index = {}
+            for path, attr in self.path_index().items():
+                if not isinstance(attr, Options):
+                    continue
+                name = environ_name(prefix, path)
+                if name not in index:
+                    index[name] = (path, attr)
+            environ[1][prefix] = index
+        return index
+
+    def update_values_by_environ(self, prefix, environ=None):
+        if environ is None:
+            environ = os.environ
+        index = self.environ_index(prefix)
+        changes = []
+        for name, text in environ.items():
+            item = index.get(name)
+            if item is None:
+                continue
+            path, attr = item
+            attr.value = environ_value(attr, text)
+            changes.append(path)
+        return changes
+
     def update_values(self, values):
         for name in values:
             attr = self.getattr(name, raw=True)
             if isinstance(attr, Config):
-                if not isinstance(values[name], dict):
+                if not isinstance(values[name], collections.abc.Mapping):
                     raise ValueError(
                         "'values[{}]' == '{}' is not instance of 'dict'".
                         format(name, values[name]))
@@ -425,9 +732,7 @@ class Config():
                     ignores=["config"],
                     dumpname=""):
         if not filename and filename_config:
-            filename_config = list(filter(str, filename_config.split(".")))
-            filename = self.getattr(
-                filename_config, raw=False)
+            filename = self.getitem(filename_config, raw=False)
         if not filename:
             raise ValueError("no filename specified")
         values = self.values()
@@ -437,10 +742,333 @@ class Config():
         }
         if dumpname:
             values = {dumpname: values}
-        utils.dump_config(values, filename=filename)
+        utils.dump_config(thaw(values), filename=filename)
         if exit:
             sys.exit(0)
 
+    def checkpoint(self):
+        tracker = super().__getattribute__("_tracker")
+        if tracker is None:
+            tracker = ChangeTracker(self)
+            super().__setattr__("_tracker", tracker)
+        tracker.reset()
+
+    def changes(self, reset=False):
+        tracker = super().__getattribute__("_tracker")
+        if tracker is None:
+            raise errors.ConfigError("no checkpoint of changes")
+        changes = tracker.changes()
+        if reset:
+            tracker.reset()
+        return changes
+
+    def copy(self):
+        return load_snapshot_node(
+            pickle.loads(
+                pickle.dumps(
+                    dump_snapshot_node(self),
+                    protocol=pickle.HIGHEST_PROTOCOL)))
+
+    def freeze(self):
+        for attr in super().__getattribute__("subitems").values():
+            attr.freeze()
+        values = self.values()
+        schema = readonly({item: Config.schema(self, item) for item in self})
+        plan = super().__getattribute__("_plan")
+        if plan is not None:
+            plan.detach()
+        super().__setattr__("__class__", FrozenConfig)
+        super().__setattr__("_index", None)
+        super().__setattr__("_accessor", None)
+        super().__setattr__("_plan", None)
+        super().__setattr__("_values", types.MappingProxyType(values))
+        super().__setattr__("_schema", schema)
+        super().__setattr__("_repr", None)
+        super().__setattr__("_namedtuple", None)
+        return self
+
+    def dump_snapshot(self, filename=""):
+        data = SNAPSHOT_MAGIC + bytes([SNAPSHOT_VERSION]) + pickle.dumps(
+            dump_snapshot_node(self), protocol=pickle.HIGHEST_PROTOCOL)
+        if filename:
+            with open(filename, "wb") as stream:
+                stream.write(data)
+        return data
+
+
+class LazyArgumentParser(argparse.ArgumentParser):
+    def __init__(self, *args, populate=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.populate = populate
+        self.commands = {}
+
+    def materialize(self, arguments=()):
+        populate, self.populate = self.populate, None
+        if populate is not None:
+            populate(parser=self)
+        for argument in arguments:
+            command = self.commands.get(argument)
+            if isinstance(command, LazyArgumentParser):
+                command.materialize(arguments)
+        return self
+
+    def arguments(self, args):
+        return sys.argv[1:] if args is None else args
+
+    def parse_args(self, args=None, namespace=None):
+        self.materialize(self.arguments(args))
+        return super().parse_args(args, namespace)
+
+    def parse_known_args(self, args=None, namespace=None):
+        self.materialize(self.arguments(args))
+        return super().parse_known_args(args, namespace)
+
+    def parse_intermixed_args(self, args=None, namespace=None):
+        self.materialize(self.arguments(args))
+        return super().parse_intermixed_args(args, namespace)
+
+    def parse_known_intermixed_args(self, args=None, namespace=None):
+        self.materialize(self.arguments(args))
+        return super().parse_known_intermixed_args(args, namespace)
+
+    def format_usage(self):
+        self.materialize()
+        return super().format_usage()
+
+    def format_help(self):
+        self.materialize()
+        return super().format_help()
+
+    def print_usage(self, file=None):
+        self.materialize()
+        return super().print_usage(file)
+
+    def print_help(self, file=None):
+        self.materialize()
+        return super().print_help(file)
+
+
+class FrozenConfig(Config):
+    def __repr__(self):
+        text = object.__getattribute__(self, "_repr")
+        if text is None:
+            text = str(thaw(object.__getattribute__(self, "_values")))
+            object.__setattr__(self, "_repr", text)
+        return text
+
+    def __delattr__(self, name):
+        raise errors.ConfigError(
+            "'{}' object is frozen: attribute '{}'".format(
+                type(self).__name__, name))
+
+    def setattr(self, name, value, raw=False):
+        raise errors.ConfigError(
+            "'{}' object is frozen: attribute '{}'".format(
+                type(self).__name__, name))
+
+    def indexes(self):
+        index = object.__getattribute__(self, "_index")
+        if index is None:
+            index = super().indexes()
+        return index
+
+    def values(self):
+        return object.__getattribute__(self, "_values")
+
+    def schema(self, name=None):
+        schema = object.__getattribute__(self, "_schema")
+        if name is None:
+            return schema
+        if isinstance(name, str) and name in schema:
+            return schema[name]
+        return super().schema(name)
+
+    def namedtuple(self):
+        view = object.__getattribute__(self, "_namedtuple")
+        if view is None:
+            view = build_namedtuple(self)
+            object.__setattr__(self, "_namedtuple", view)
+        return view
+
+    def freeze(self):
+        return self
+
+
+class ChangeTracker():
+    def __init__(self, config):
+        self.config = config
+        self.version = None
+        self.leaves = {}
+        self.records = {}
+        self.added = set()
+
+    def attach(self, record=False):
+        version = structure_version(self.config)
+        if self.version == version:
+            return
+        self.version = version
+        leaves = {}
+        for path, attr in self.config.path_index().items():
+            if isinstance(attr, Options):
+                leaves[id(attr)] = (attr, path)
+        for key, (attr, path) in self.leaves.items():
+            if key not in leaves:
+                attr.unwatch(self.record)
+                if record:
+                    self.records.setdefault(path, (attr, attr.value))
+        for key, (attr, path) in leaves.items():
+            if key in self.leaves:
+                continue
+            attr.watch(self.record)
+            if not record:
+                continue
+            if path in self.records:
+                self.records[path] = (attr, self.records[path][1])
+            else:
+                self.records[path] = (attr, None)
+                self.added.add(path)
+        self.leaves = leaves
+
+    def record(self, options, name, old):
+        if name != "value":
+            return
+        attr, path = self.leaves[id(options)]
+        if path not in self.records:
+            self.records[path] = (attr, old)
+
+    def reset(self):
+        self.records = {}
+        self.added = set()
+        self.attach()
+
+    def changes(self):
+        self.attach(record=True)
+        index = self.config.path_index()
+        result = {}
+        for path, (attr, old) in self.records.items():
+            if index.get(path) is not attr:
+                if path not in self.added:
+                    result[path] = (old, None)
+                continue
+            if type(old) is not type(attr.value) or old != attr.value:
+                result[path] = (old, attr.value)
+        return result
+
+
+def dump_snapshot_node(attr):
+    if isinstance(attr, Config):
+        return {
+            name: dump_snapshot_node(item)
+            for name, item in attr.items(raw=True)
+        }
+    values = [getattr(attr, name) for name in attr.NAMES]
+    if isinstance(attr.argoptions, ArgumentOptions):
+        values[-1] = tuple(
+            getattr(attr.argoptions, name) for name in ArgumentOptions.NAMES)
+    return tuple(values)
+
+
+def restore_config(subitems, frozen=False):
+    config = object.__new__(Config)
+    for attr in subitems.values():
+        if isinstance(attr, Config):
+            object.__setattr__(attr, "_parent", config)
+    object.__setattr__(config, "subitems", subitems)
+    init_private(config)
+    if frozen:
+        config.freeze()
+    return config
+
+
+def load_snapshot_node(node):
+    if isinstance(node, dict):
+        return restore_config({
+            name: load_snapshot_node(item)
+            for name, item in node.items()
+        })
+    if isinstance(node[-1], tuple):
+        node = node[:-1] + (restore_options(ArgumentOptions, node[-1]), )
+    return restore_options(Options, node)
+
+
+def load_snapshot(data):
+    if isinstance(data, str):
+        with open(data, "rb") as stream:
+            data = stream.read()
+    header = SNAPSHOT_MAGIC + bytes([SNAPSHOT_VERSION])
+    if data[:len(header)] != header:
+        raise errors.ConfigError("not a config snapshot of version {}".format(
+            SNAPSHOT_VERSION))
+    return load_snapshot_node(pickle.loads(data[len(header):]))
+
+
+def check_environ_prefix(prefix):
+    if not isinstance(prefix, str) or not prefix:
+        raise ValueError("environ prefix('{}') must be a non-empty str".format(
+            prefix))
+
+
+def environ_name(prefix, path):
+    name = path.upper().replace(Config.ATTR_INDICATOR, "_").replace("-", "_")
+    return "{}_{}".format(prefix, name)
+
+
+def environ_value(attr, text):
+    if attr.type in ("list", "dict"):
+        try:
+            value = yaml.safe_load(text)
+        except yaml.YAMLError:
+            value = text
+        if attr.type == "list" and not isinstance(value, list):
+            value = [item.strip() for item in text.split(",") if item.strip()]
+        return value
+    if attr.type == "bool":
+        return str2bool(text)
+    return text
+
+
+def scan_argument(arguments, option):
+    value = None
+    for index, argument in enumerate(arguments):
+        if argument == "--":
+            break
+        if argument == option and index + 1 < len(arguments):
+            value = arguments[index + 1]
+        elif argument.startswith(option + "="):
+            value = argument[len(option) + 1:]
+    return value
+
+
+def options_values(schema):
+    if isinstance(schema, Options):
+        values = schema.values()
+    elif isinstance(schema, collections.abc.Mapping):
+        for key in schema:
+            if key[:1] == Config.ATTR_INDICATOR:
+                break
+        else:
+            return None
+        values = {(key[1:] if key[:1] == Config.ATTR_INDICATOR else key):
+                  value
+                  for key, value in schema.items()}
+    else:
+        values = {"value": schema}
+    if (("value" in values) and (values["value"] is not None)):
+        if (("type" not in values) or (values["type"] is None)):
+            values["type"] = utils.typename(type(values["value"]))
+    return values
+
+
+def readonly(values):
+    return types.MappingProxyType({
+        key: readonly(value) if isinstance(value, dict) else value
+        for key, value in values.items()
+    })
+
+
+def thaw(values):
+    return thaw_value(values)
+
 
 def normalize_subcommands(subcommands):
     if isinstance(subcommands, dict):
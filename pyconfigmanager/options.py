@@ -1,86 +1,329 @@
-from .utils import typename, locate_type, convert_type
+from .utils import typename, locate_type, convert_type, compile_converter
+from . import errors
+import collections.abc
+import functools
+
+VIOLATION_MESSAGES = {
+    "required": "'{}' object: attribute 'value' required",
+    "type": "'{}' object: attribute 'value': '{}' is not type '{}'",
+    "min": "'{}' object: attribute 'value': '{}' required >= {}",
+    "max": "'{}' object: attribute 'value': '{}' required <= {}",
+}
 
 
 class BasicOptions():
+    __slots__ = ()
+    NAMES = ()
+
+    def __new__(cls, names=[], **kwargs):
+        if cls is BasicOptions:
+            cls = basic_options_class(names)
+        return super().__new__(cls)
+
     def __init__(self, names=[], **kwargs):
-        for name in names:
-            super().__setattr__(name, None)
+        for name in self.NAMES:
+            object.__setattr__(self, name, None)
         self.update_values(kwargs)
 
-    def __setattr__(self, name, value):
-        if not hasattr(self, name):
-            raise AttributeError("'{}' object has no attribute '{}'".format(
-                type(self).__name__, name))
-        return super().__setattr__(name, value)
-
     def __repr__(self):
-        return str(vars(self))
+        return str(self.values())
+
+    def __reduce__(self):
+        return (restore_options, (options_class_reference(type(self)),
+                                  tuple(getattr(self, name)
+                                        for name in self.NAMES)))
+
+    def values(self):
+        return {name: getattr(self, name) for name in self.NAMES}
 
     def update_values(self, values, merge=False):
         for name in values:
             if (not merge) or (values[name] is not None):
                 setattr(self, name, values[name])
 
+    def freeze(self):
+        object.__setattr__(self, "__class__", frozen_class(type(self)))
+        return self
+
+
+_basic_options_classes = {}
+
+
+def basic_options_class(names):
+    names = tuple(names)
+    options_class = _basic_options_classes.get(names)
+    if options_class is None:
+        options_class = type(BasicOptions.__name__, (BasicOptions, ), {
+            "__slots__": names,
+            "NAMES": names,
+            "__module__": __name__,
+        })
+        _basic_options_classes[names] = options_class
+    return options_class
+
+
+def frozen_setattr(self, name, value):
+    raise errors.ConfigError("'{}' object is frozen: attribute '{}'".format(
+        type(self).__name__, name))
+
+
+_frozen_classes = {}
+
+
+def frozen_class(options_class):
+    if getattr(options_class, "FROZEN", False):
+        return options_class
+    frozen = _frozen_classes.get(options_class)
+    if frozen is None:
+        frozen = type("Frozen" + options_class.__name__, (options_class, ), {
+            "__slots__": (),
+            "__setattr__": frozen_setattr,
+            "FROZEN": True,
+            "__module__": __name__,
+        })
+        _frozen_classes[options_class] = frozen
+    return frozen
+
+
+def options_class_reference(options_class):
+    frozen = getattr(options_class, "FROZEN", False)
+    base = options_class.__bases__[0] if frozen else options_class
+    if _basic_options_classes.get(base.NAMES) is base:
+        base = base.NAMES
+    if base is options_class:
+        return options_class
+    return (base, frozen)
+
+
+def resolve_options_class(reference):
+    if isinstance(reference, type):
+        return reference
+    base, frozen = reference
+    if not isinstance(base, type):
+        base = basic_options_class(base)
+    return frozen_class(base) if frozen else base
+
+
+def frozen_method(name):
+    def method(self, *args, **kwargs):
+        raise errors.ConfigError(
+            "'{}' object is frozen: method '{}'".format(
+                type(self).__name__, name))
+
+    return method
+
+
+def frozen_container(container, names):
+    namespace = {name: frozen_method(name) for name in names}
+    namespace.update({
+        "__slots__": (),
+        "__reduce__": lambda self: (type(self), (container(self), )),
+        "__module__": __name__,
+    })
+    return type("Frozen" + container.__name__.capitalize(), (container, ),
+                namespace)
+
+
+FrozenList = frozen_container(list, (
+    "__setitem__",
+    "__delitem__",
+    "__iadd__",
+    "__imul__",
+    "append",
+    "extend",
+    "insert",
+    "pop",
+    "remove",
+    "clear",
+    "sort",
+    "reverse",
+))
+FrozenDict = frozen_container(dict, (
+    "__setitem__",
+    "__delitem__",
+    "__ior__",
+    "clear",
+    "pop",
+    "popitem",
+    "setdefault",
+    "update",
+))
+
+
+def freeze_value(value):
+    if isinstance(value, list):
+        return FrozenList(freeze_value(item) for item in value)
+    if isinstance(value, dict):
+        return FrozenDict(
+            (key, freeze_value(item)) for key, item in value.items())
+    return value
+
+
+def thaw_value(value):
+    if isinstance(value, list):
+        return [thaw_value(item) for item in value]
+    if isinstance(value, collections.abc.Mapping):
+        return {key: thaw_value(item) for key, item in value.items()}
+    return value
+
 
 class ArgumentOptions(BasicOptions):
+    NAMES = (
+        "nargs",
+        "const",
+        "default",
+        "type",
+        "choices",
+        "required",
+        "help",
+        "metavar",
+        "dest",
+        "action",
+        "position",
+        "short",
+    )
+    __slots__ = NAMES + ("_version", )
+
     def __init__(self, **kwargs):
-        super().__init__([
-            "nargs",
-            "const",
-            "default",
-            "type",
-            "choices",
-            "required",
-            "help",
-            "metavar",
-            "dest",
-            "action",
-            "position",
-            "short",
-        ], **kwargs)
+        object.__setattr__(self, "_version", 0)
+        super().__init__(**kwargs)
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        object.__setattr__(self, "_version", self._version + 1)
 
 
 class Options(BasicOptions):
+    NAMES = ("type", "value", "required", "min", "max", "help", "argoptions")
+    __slots__ = NAMES + ("_converter", "_watchers", "_argcache")
+
     def __init__(self, **kwargs):
-        super().__init__(
-            ["type", "value", "required", "min", "max", "help", "argoptions"],
-            **kwargs)
+        object.__setattr__(self, "_converter", None)
+        object.__setattr__(self, "_watchers", None)
+        object.__setattr__(self, "_argcache", None)
+        super().__init__(**kwargs)
 
     def __setattr__(self, name, value):
-        if name == "argoptions":
+        if name == "value":
+            if self._converter is not None and value is not None:
+                value = self._converter(value)
+        elif name == "max" or name == "min":
+            if self._converter is not None and value is not None:
+                value = self._converter(value)
+        elif name == "argoptions":
             if isinstance(value, ArgumentOptions):
                 pass
-            elif isinstance(value, dict):
+            elif isinstance(value, collections.abc.Mapping):
                 value = ArgumentOptions(**value)
             else:
                 value = bool(value)
-        if name == "type" and value is not None:
+        elif name == "type" and value is not None:
             if isinstance(value, type):
                 value = typename(value)
             else:
                 value = str(value)
+            converter = type_converter(value)
+            object.__setattr__(self, "_converter", converter)
+            old_value = self.value
             if self.value is not None:
-                super().__setattr__("value", convert_type(self.value, value))
+                super().__setattr__("value", converter(self.value))
             if self.max is not None:
-                super().__setattr__("max", convert_type(self.max, value))
+                super().__setattr__("max", converter(self.max))
             if self.min is not None:
-                super().__setattr__("min", convert_type(self.min, value))
+                super().__setattr__("min", converter(self.min))
+            if self._watchers is not None and old_value is not self.value:
+                self.notify("value", old_value)
+        elif name == "type":
+            object.__setattr__(self, "_converter", None)
+
+        if self._watchers is None:
+            return super().__setattr__(name, value)
+        old = getattr(self, name)
+        super().__setattr__(name, value)
+        self.notify(name, old)
 
-        if name == "max" or name == "min" or name == "value":
-            if self.type is not None and value is not None:
-                value = convert_type(value, self.type)
+    def watch(self, watcher):
+        watchers = self._watchers or ()
+        if watcher not in watchers:
+            object.__setattr__(self, "_watchers", watchers + (watcher, ))
 
-        return super().__setattr__(name, value)
+    def unwatch(self, watcher):
+        watchers = tuple(item for item in (self._watchers or ())
+                         if item != watcher)
+        object.__setattr__(self, "_watchers", watchers or None)
+
+    def freeze(self):
+        if isinstance(self.argoptions, ArgumentOptions):
+            self.argoptions.freeze()
+        if not getattr(self, "FROZEN", False):
+            object.__setattr__(self, "value", freeze_value(self.value))
+        return super().freeze()
+
+    def notify(self, name, old):
+        for watcher in self._watchers:
+            watcher(self, name, old)
+
+    def merge_values(self, values):
+        for name in values:
+            if name not in self.NAMES:
+                raise AttributeError(
+                    "'{}' object has no attribute '{}'".format(
+                        type(self).__name__, name))
+        converter = self._converter
+        changed = False
+        for name in self.NAMES:
+            if name not in values:
+                continue
+            value = values[name]
+            if name == "type" and value is not None:
+                if isinstance(value, type):
+                    value = typename(value)
+                else:
+                    value = str(value)
+                converter = type_converter(value)
+            elif name == "argoptions":
+                if isinstance(value, collections.abc.Mapping):
+                    value = ArgumentOptions(**value)
+                elif not isinstance(value, ArgumentOptions):
+                    value = bool(value)
+            elif converter is not None and value is not None and (
+                    name == "value" or name == "min" or name == "max"):
+                value = converter(value)
+            if value is None:
+                continue
+            current = getattr(self, name)
+            if isinstance(value, ArgumentOptions) and isinstance(
+                    current, ArgumentOptions):
+                if value.values() == current.values():
+                    continue
+            elif type(value) is type(current) and value == current:
+                continue
+            setattr(self, name, value)
+            changed = True
+        return changed
 
     def argument_options(self):
-        argoptions = ArgumentOptions(
-            type=self.type, default=self.value, help=self.help or " ")
-        options = vars(argoptions)
+        argoptions = self.argoptions
+        key = (self.type, self.help, argoptions,
+               argoptions._version
+               if isinstance(argoptions, ArgumentOptions) else None)
+        cache = self._argcache
+        if cache is None or cache[0] != key:
+            cache = (key, self.compile_argument_options())
+            object.__setattr__(self, "_argcache", cache)
+        options = dict(cache[1])
+        if "default" not in options and self.value is not None:
+            options["default"] = self.value
+        return options
+
+    def compile_argument_options(self):
+        argoptions = ArgumentOptions(type=self.type, help=self.help or " ")
+        options = argoptions.values()
 
         if isinstance(self.argoptions, ArgumentOptions):
             options.update({
                 key: value
-                for key, value in vars(self.argoptions).items()
+                for key, value in self.argoptions.values().items()
                 if value is not None
             })
         if self.type:
@@ -114,28 +357,65 @@ class Options(BasicOptions):
         }
         return options
 
-    def assert_value(self, options=None):
+    def violations(self, options=None):
         if options is None:
             options = self
-        else:
-            if not isinstance(options, Options):
-                options = Options(**options)
+        elif not isinstance(options, Options):
+            options = Options(**options)
         class_name = type(options).__name__
-        if options.required:
-            assert self.value is not None, (
-                "'{}' object: attribute 'value' required".format(class_name))
-        if options.type is not None:
-            assert isinstance(self.value, locate_type(options.type)), (
-                "'{}' object: attribute 'value': '{}' is not type '{}'".format(
-                    class_name, self.value, options.type))
-        if options.min is not None:
-            assert self.value >= options.min, (
-                "'{}' object: attribute 'value': '{}' required >= {}".format(
-                    class_name, self.value, options.min))
-        if options.max is not None:
-            assert self.value <= options.max, (
-                "'{}' object: attribute 'value': '{}' required <= {}".format(
-                    class_name, self.value, options.max))
+        value = self.value
+        result = []
+        if options.required and value is None:
+            result.append(("required",
+                           VIOLATION_MESSAGES["required"].format(class_name)))
+        if options.type is not None and not isinstance(
+                value, locate_type(options.type)):
+            result.append(("type", VIOLATION_MESSAGES["type"].format(
+                class_name, value, options.type)))
+        if value is None:
+            return result
+        for kind, bound in (("min", options.min), ("max", options.max)):
+            if bound is None:
+                continue
+            try:
+                valid = value >= bound if kind == "min" else value <= bound
+            except TypeError:
+                valid = False
+            if not valid:
+                result.append((kind, VIOLATION_MESSAGES[kind].format(
+                    class_name, value, bound)))
+        return result
+
+    def assert_value(self, options=None):
+        violations = self.violations(options)
+        if violations:
+            raise AssertionError(violations[0][1])
+
+
+def type_converter(value_type):
+    try:
+        return compile_converter(value_type)
+    except NameError:
+        return functools.partial(convert_type, value_type=value_type)
+
+
+def restore_options(options_class, values):
+    options_class = resolve_options_class(options_class)
+    options = object.__new__(options_class)
+    setattr = object.__setattr__
+    for name, value in zip(options_class.NAMES, values):
+        setattr(options, name, value)
+    if issubclass(options_class, ArgumentOptions):
+        setattr(options, "_version", 0)
+    if issubclass(options_class, Options):
+        if not getattr(options_class, "FROZEN", False) and isinstance(
+                options.value, (FrozenList, FrozenDict)):
+            setattr(options, "value", thaw_value(options.value))
+        setattr(options, "_watchers", None)
+        setattr(options, "_argcache", None)
+        setattr(options, "_converter", None if options.type is None else
+                type_converter(options.type))
+    return options
 
 
 def str2bool(value):
@@ -0,0 +1,274 @@
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import threading
+import time
+from . import utils
+from .config import Config
+from .cache import getcache
+
+
+def filestamp(filename):
+    try:
+        stat = os.stat(filename)
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+class PollWatcher():
+    def __init__(self, filenames):
+        self.stamps = {filename: filestamp(filename) for filename in filenames}
+
+    def wait(self, timeout):
+        changes = self.check()
+        if changes:
+            return changes
+        time.sleep(timeout)
+        return self.check()
+
+    def check(self):
+        changes = set()
+        for filename, stamp in self.stamps.items():
+            current = filestamp(filename)
+            if current != stamp:
+                self.stamps[filename] = current
+                changes.add(filename)
+        return changes
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher():
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_NONBLOCK = 0x00000800
+    IN_CLOEXEC = 0x00080000
+    MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+            | IN_DELETE)
+    EVENT = struct.Struct("iIII")
+
+    def __init__(self, filenames):
+        libc_name = ctypes.util.find_library("c")
+        if not libc_name:
+            raise OSError("libc can not be located")
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify is not supported")
+        self.descriptor = libc.inotify_init1(self.IN_NONBLOCK
+                                             | self.IN_CLOEXEC)
+        if self.descriptor < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.directories = {}
+        self.filenames = set(filenames)
+        try:
+            for directory in set(
+                    os.path.dirname(filename) for filename in filenames):
+                handle = libc.inotify_add_watch(
+                    self.descriptor, os.fsencode(directory), self.MASK)
+                if handle < 0:
+                    raise OSError(ctypes.get_errno(),
+                                  "inotify_add_watch failed", directory)
+                self.directories[handle] = directory
+        except BaseException:
+            self.close()
+            raise
+
+    def wait(self, timeout):
+        readable, _, _ = select.select([self.descriptor], [], [], timeout)
+        if not readable:
+            return set()
+        changes = set()
+        while True:
+            try:
+                data = os.read(self.descriptor, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                handle, _, _, size = self.EVENT.unpack_from(data, offset)
+                offset += self.EVENT.size
+                name = data[offset:offset + size].rstrip(b"\0")
+                offset += size
+                filename = os.path.join(
+                    self.directories.get(handle, ""), os.fsdecode(name))
+                if filename in self.filenames:
+                    changes.add(filename)
+        return changes
+
+    def close(self):
+        if self.descriptor >= 0:
+            os.close(self.descriptor)
+            self.descriptor = -1
+
+
+def getwatcher(filenames, watcher=None):
+    if watcher == "poll":
+        return PollWatcher(filenames)
+    elif watcher == "inotify":
+        return InotifyWatcher(filenames)
+    elif watcher is not None:
+        return watcher
+    try:
+        return InotifyWatcher(filenames)
+    except (OSError, AttributeError):
+        return PollWatcher(filenames)
+
+
+class ConfigReloader():
+    def __init__(self,
+                 schema=[],
+                 values=[],
+                 pickname="",
+                 excludes=["schema"],
+                 cache=None,
+                 interval=1.0,
+                 debounce=0.2,
+                 watcher=None):
+        if (not isinstance(schema, list)) and (not isinstance(schema, tuple)):
+            schema = [schema]
+        if (not isinstance(values, list)) and (not isinstance(values, tuple)):
+            values = [values]
+        self.schema = [self.normalize(item) for item in schema]
+        self.values = [self.normalize(item) for item in values]
+        self.pickname = pickname
+        self.excludes = excludes
+        self.cache = getcache(cache)
+        self.interval = interval
+        self.debounce = debounce
+        self.watcher = watcher
+        self.subscribers = []
+        self.documents = {}
+        self.lock = threading.Lock()
+        self.thread = None
+        self.stopped = threading.Event()
+        for filename in self.filenames():
+            self.load(filename)
+        self.config = self.build()
+
+    def normalize(self, item):
+        if isinstance(item, str):
+            return os.path.abspath(os.path.expanduser(item))
+        return item
+
+    def filenames(self):
+        result = []
+        for item in self.schema + self.values:
+            if isinstance(item, str) and item not in result:
+                result.append(item)
+        return result
+
+    def load(self, filename):
+        self.documents[filename] = [
+            utils.pickitems(entry, excludes=self.excludes)
+            for entry in utils.load_config(
+                filename, pickname=self.pickname, cache=self.cache)
+        ]
+
+    def layers(self, items):
+        for item in items:
+            if isinstance(item, str):
+                for entry in self.documents[item]:
+                    yield entry
+            else:
+                yield utils.pickitems(
+                    item, pickname=self.pickname, excludes=self.excludes)
+
+    def build(self):
+        config = Config()
+        for item in self.layers(self.schema):
+            config.update_schema(schema=item, merge=True)
+        for item in self.layers(self.values):
+            config.update_values(values=item)
+        return config
+
+    def subscribe(self, callback):
+        self.subscribers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        self.subscribers.remove(callback)
+
+    def reload(self, filenames=None):
+        with self.lock:
+            if filenames is None:
+                filenames = self.filenames()
+            documents = dict(self.documents)
+            try:
+                for filename in filenames:
+                    self.load(filename)
+                fresh = self.build()
+            except Exception as error:
+                self.documents = documents
+                logging.warning("reload {} failed, {}: {}".format(
+                    list(filenames), error.__class__.__name__, error))
+                return {}
+            changes = self.diff(self.config, fresh)
+            plan = object.__getattribute__(self.config, "_plan")
+            if plan is not None:
+                fresh.validation_plan().inherit(plan, changes)
+            self.config = fresh
+        if changes:
+            for callback in list(self.subscribers):
+                callback(fresh, changes)
+        return changes
+
+    def diff(self, config, fresh):
+        old = self.leaf_values(config)
+        new = self.leaf_values(fresh)
+        changes = {}
+        for path in list(old) + [path for path in new if path not in old]:
+            before = old.get(path)
+            after = new.get(path)
+            if type(before) is not type(after) or before != after:
+                changes[path] = (before, after)
+        return changes
+
+    def leaf_values(self, config):
+        return {
+            path: attr.value
+            for path, attr in config.path_index().items()
+            if not isinstance(attr, Config)
+        }
+
+    def run(self, watcher):
+        try:
+            while not self.stopped.is_set():
+                changes = watcher.wait(self.interval)
+                if not changes:
+                    continue
+                while not self.stopped.is_set():
+                    more = watcher.wait(self.debounce)
+                    if not more:
+                        break
+                    changes |= more
+                self.reload([
+                    filename for filename in self.filenames()
+                    if filename in changes
+                ])
+        finally:
+            watcher.close()
+
+    def start(self):
+        if self.thread is not None:
+            return self
+        self.stopped.clear()
+        watcher = getwatcher(self.filenames(), self.watcher)
+        self.thread = threading.Thread(
+            target=self.run, args=(watcher, ), daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join(timeout)
+            self.thread = None
@@ -0,0 +1,30 @@
+from .config import Config
+import threading
+
+
+class SharedConfig():
+    def __init__(self, config=None):
+        self.lock = threading.Lock()
+        if config is None:
+            config = Config()
+        self.config = config.copy().freeze()
+
+    def publish(self, config):
+        snapshot = config.copy().freeze()
+        with self.lock:
+            self.config = snapshot
+        return snapshot
+
+    def update(self, function, *args, **kwargs):
+        with self.lock:
+            config = self.config.copy()
+            result = function(config, *args, **kwargs)
+            self.config = config.freeze()
+        return result
+
+    def update_values(self, values):
+        return self.update(lambda config: config.update_values(values))
+
+    def update_schema(self, schema={}, merge=True):
+        return self.update(
+            lambda config: config.update_schema(schema, merge=merge))
@@ -0,0 +1,206 @@
+from pyconfigmanager import utils
+from .config import Config, check_environ_prefix, structure_version
+from .cache import getcache
+from .reload import filestamp
+import os
+import sys
+import time
+
+
+class Source():
+    def __init__(self, kind="values"):
+        if kind not in ("schema", "values"):
+            raise ValueError("kind('{}') must be 'schema' or 'values'".format(
+                kind))
+        self.kind = kind
+        self.version = 0
+
+    def invalidate(self):
+        self.version += 1
+
+    def key(self):
+        return (self.version, self.fingerprint())
+
+    def fingerprint(self):
+        return None
+
+    def load(self):
+        return []
+
+    def apply(self, config, data):
+        for item in data:
+            if self.kind == "schema":
+                config.update_schema(schema=item, merge=True)
+            else:
+                config.update_values(values=item)
+
+
+class FileSource(Source):
+    def __init__(self,
+                 filename,
+                 kind="values",
+                 pickname="",
+                 excludes=["schema"],
+                 cache=None):
+        super().__init__(kind=kind)
+        self.filename = filename
+        self.pickname = pickname
+        self.excludes = excludes
+        self.cache = getcache(cache)
+
+    def fingerprint(self):
+        return filestamp(self.filename)
+
+    def load(self):
+        return [
+            utils.pickitems(entry, excludes=self.excludes)
+            for entry in utils.load_config(
+                self.filename, pickname=self.pickname, cache=self.cache)
+        ]
+
+
+class DictSource(Source):
+    def __init__(self, data, kind="values", pickname="", excludes=["schema"]):
+        super().__init__(kind=kind)
+        self.data = data
+        self.pickname = pickname
+        self.excludes = excludes
+
+    def update(self, data):
+        self.data = data
+        self.invalidate()
+
+    def load(self):
+        data = self.data
+        if not isinstance(data, list) and not isinstance(data, tuple):
+            data = [data]
+        return [
+            utils.pickitems(
+                item, pickname=self.pickname, excludes=self.excludes)
+            for item in data
+        ]
+
+
+class EnvironSource(Source):
+    def __init__(self, prefix, environ=None):
+        super().__init__(kind="values")
+        check_environ_prefix(prefix)
+        self.prefix = prefix
+        self.environ = environ
+
+    def fingerprint(self):
+        environ = os.environ if self.environ is None else self.environ
+        start = self.prefix + "_"
+        return tuple(
+            sorted((name, value) for name, value in environ.items()
+                   if name.startswith(start)))
+
+    def load(self):
+        return dict(self.fingerprint())
+
+    def apply(self, config, data):
+        config.update_values_by_environ(self.prefix, environ=data)
+
+
+class ArgvSource(Source):
+    def __init__(self, arguments=None, subcommands=()):
+        super().__init__(kind="values")
+        self.arguments = arguments
+        self.subcommands = subcommands
+        self.args = None
+
+    def fingerprint(self):
+        if self.arguments is None:
+            return tuple(sys.argv[1:])
+        return tuple(self.arguments)
+
+    def load(self):
+        return list(self.fingerprint())
+
+    def apply(self, config, data):
+        parser = config.argument_parser(subcommands=self.subcommands)
+        self.args = parser.parse_args(data)
+        config.update_values_by_arguments(
+            self.args, subcommands=self.subcommands)
+
+
+class RemoteSource(Source):
+    def __init__(self, fetch, kind="values", ttl=None):
+        super().__init__(kind=kind)
+        self.fetch = fetch
+        self.ttl = ttl
+
+    def fingerprint(self):
+        if not self.ttl:
+            return None
+        return int(time.time() // self.ttl)
+
+    def load(self):
+        data = self.fetch()
+        if not isinstance(data, list) and not isinstance(data, tuple):
+            data = [data]
+        return list(data)
+
+
+class Pipeline():
+    def __init__(self, sources=[]):
+        self.sources = list(sources)
+        self.layers = []
+        self.working = None
+        self.config = None
+
+    def add(self, source):
+        self.sources.append(source)
+        return source
+
+    def invalid_layer(self, keys):
+        for index, (source, key) in enumerate(zip(self.sources, keys)):
+            if index >= len(self.layers):
+                return index
+            layer_source, layer_key, _, _ = self.layers[index]
+            if layer_source is not source or layer_key != key:
+                return index
+        if len(self.layers) != len(self.sources) or self.config is None:
+            return len(self.sources)
+        return None
+
+    def rewind(self, start):
+        working = self.working
+        layers = self.layers[start:]
+        if working is None or any(undo is None for _, _, _, undo in layers):
+            return Config(), 0
+        for _, _, _, undo in reversed(layers):
+            index = working.path_index()
+            for path, value in undo.items():
+                index[path].value = value
+        return working, start
+
+    def refresh(self):
+        keys = [source.key() for source in self.sources]
+        start = self.invalid_layer(keys)
+        if start is None:
+            return self.config
+        config, start = self.rewind(start)
+        layers = self.layers[:start]
+        for index in range(start, len(self.sources)):
+            source, key = self.sources[index], keys[index]
+            if (index < len(self.layers) and self.layers[index][0] is source
+                    and self.layers[index][1] == key):
+                data = self.layers[index][2]
+            else:
+                data = source.load()
+            version = structure_version(config)
+            config.checkpoint()
+            source.apply(config, data)
+            undo = None
+            if source.kind == "values" and structure_version(
+                    config) == version:
+                undo = {
+                    path: old
+                    for path, (old, _) in config.changes().items()
+                }
+            layers.append((source, key, data, undo))
+        self.layers = layers
+        self.working = config
+        self.config = config.copy().freeze()
+        return self.config
@@ -0,0 +1,96 @@
+import unittest
+from pyconfigmanager import validatefiles, batch
+from pyconfigmanager.config import Config
+import os
+import tempfile
+
+
+class TestValidateFiles(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.schema = {
+            "port": {
+                ".type": "int",
+                ".min": 1,
+                ".max": 65535,
+                ".value": 80,
+            },
+            "name": {
+                ".type": "str",
+                ".required": True,
+            },
+        }
+        self.filenames = [
+            self.write("good.yaml", "name: a\nport: 8080\n"),
+            self.write("bad.json", '{"port": 70000}'),
+            self.write("broken.yaml", "name: [a\n"),
+            os.path.join(self.tempdir.name, "missing.yaml"),
+        ]
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def write(self, name, contents):
+        filename = os.path.join(self.tempdir.name, name)
+        with open(filename, "w") as stream:
+            stream.write(contents)
+        return filename
+
+    def check(self, results):
+        results = dict(results)
+        self.assertSetEqual(set(results), set(self.filenames))
+        good, bad, broken, missing = [
+            results[filename] for filename in self.filenames
+        ]
+        self.assertTrue(good.isvalid())
+        self.assertListEqual([(item.path, item.kind) for item in bad],
+                             [("port", "max"), ("name", "required"),
+                              ("name", "type")])
+        self.assertListEqual([item.kind for item in broken], ["load"])
+        self.assertListEqual([item.kind for item in missing], ["load"])
+
+    def test_serial(self):
+        self.check(validatefiles(self.schema, self.filenames, processes=1))
+
+    def test_pool(self):
+        self.check(
+            validatefiles(Config(self.schema), self.filenames, processes=2))
+
+    def test_reset_between_files(self):
+        filenames = [
+            self.filenames[1],
+            self.write("partial.yaml", "name: b\n"),
+            self.write("multi.yaml", "port: 0\n---\nname: c\nsize: 1\n"),
+            self.write("port.yaml", "name: d\n"),
+        ]
+        results = list(validatefiles(self.schema, filenames, processes=1))
+        self.assertListEqual([filename for filename, _ in results], filenames)
+        reports = [report for _, report in results]
+        self.assertEqual(len(reports[0]), 3)
+        self.assertTrue(reports[1].isvalid())
+        self.assertListEqual([item.kind for item in reports[2]], ["load"])
+        self.assertTrue(reports[3].isvalid())
+        state = batch.worker_state(
+            Config(self.schema).dump_snapshot(), "", ["schema"], None)
+        for filename in filenames:
+            batch.validate_file(filename, state)
+        self.assertIs(state["config"].validation_plan(), state["plan"])
+        self.assertEqual(state["config"].port, 80)
+        self.assertDictEqual(batch._worker_state, {})
+
+    def test_interleaved(self):
+        strict = dict(self.schema, port={".type": "int", ".max": 100})
+        filenames = [self.filenames[1], self.filenames[0]]
+        loose = validatefiles(self.schema, filenames, processes=1)
+        tight = validatefiles(strict, filenames, processes=1)
+        results = []
+        for pair in zip(loose, tight):
+            results.extend(pair)
+        self.assertListEqual([len(report) for _, report in results],
+                             [3, 3, 0, 1])
+
+    def test_load_message(self):
+        results = dict(
+            validatefiles(self.schema, self.filenames[2:], processes=1))
+        message = results[self.filenames[3]].messages()[0]
+        self.assertTrue(message.startswith("FileNotFoundError: "))
@@ -0,0 +1,153 @@
+import unittest
+from pyconfigmanager.cache import ConfigCache
+from pyconfigmanager import cache as cache_module
+from pyconfigmanager import getconfig, getschema
+from pyconfigmanager import errors
+import os
+import tempfile
+import time
+
+
+class TestConfigCache(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.tempdir.name, "cache")
+        self.filename = os.path.join(self.tempdir.name, "values.yaml")
+        with open(self.filename, "wt") as stream:
+            stream.write("test:\n  a: 12\n  b:\n    c: hello\n")
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_load(self):
+        cache = ConfigCache(self.directory)
+        parsed = []
+        parse = cache.parse
+
+        def counting_parse(*args, **kwargs):
+            parsed.append(args[0])
+            return parse(*args, **kwargs)
+
+        cache.parse = counting_parse
+        self.assertListEqual(
+            cache.load(self.filename), [{
+                "test": {
+                    "a": 12,
+                    "b": {
+                        "c": "hello"
+                    }
+                }
+            }])
+        self.assertListEqual(
+            cache.load(self.filename, pickname="test.b"), [{
+                "c": "hello"
+            }])
+        self.assertEqual(len(parsed), 2)
+        self.assertListEqual(
+            cache.load(self.filename, pickname="test.b"), [{
+                "c": "hello"
+            }])
+        self.assertEqual(len(parsed), 2)
+        self.assertEqual(len(cache.entries()), 2)
+
+        stat = os.stat(self.filename)
+        os.utime(self.filename, ns=(stat.st_atime_ns,
+                                    stat.st_mtime_ns + 10**9))
+        cache.load(self.filename)
+        self.assertEqual(len(parsed), 2)
+
+        with open(self.filename, "wt") as stream:
+            stream.write("test:\n  a: 34\n")
+        os.utime(self.filename, ns=(stat.st_atime_ns,
+                                    stat.st_mtime_ns + 2 * 10**9))
+        self.assertListEqual(cache.load(self.filename), [{"test": {"a": 34}}])
+        self.assertEqual(len(parsed), 3)
+
+        stat = os.stat(self.filename)
+        with open(self.filename, "wt") as stream:
+            stream.write("test:\n  a: 56\n")
+        os.utime(self.filename, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertListEqual(cache.load(self.filename), [{"test": {"a": 56}}])
+        self.assertEqual(len(parsed), 4)
+        with open(self.filename, "wt") as stream:
+            stream.write("test:\n  a: 34\n")
+
+        with open(cache.entry(self.filename), "wb") as stream:
+            stream.write(b"broken")
+        self.assertListEqual(cache.load(self.filename), [{"test": {"a": 34}}])
+        cache.clear()
+        self.assertListEqual(cache.entries(), [])
+
+    def test_load_stamp(self):
+        cache = ConfigCache(self.directory)
+        digests = []
+        digest = cache_module.file_digest
+
+        def counting_digest(filename):
+            digests.append(filename)
+            return digest(filename)
+
+        cache_module.file_digest = counting_digest
+        try:
+            cache.load(self.filename)
+            cache.load(self.filename)
+            self.assertEqual(len(digests), 2)
+            mtime = time.time_ns() - 10 * 10**9
+            os.utime(self.filename, ns=(mtime, mtime))
+            cache.load(self.filename)
+            self.assertEqual(len(digests), 3)
+            self.assertListEqual(
+                cache.load(self.filename), [{
+                    "test": {
+                        "a": 12,
+                        "b": {
+                            "c": "hello"
+                        }
+                    }
+                }])
+            self.assertEqual(len(digests), 3)
+            os.utime(self.filename, ns=(mtime, mtime + 1))
+            cache.load(self.filename)
+            self.assertEqual(len(digests), 4)
+        finally:
+            cache_module.file_digest = digest
+
+    @unittest.skipUnless(hasattr(os, "getuid"), "requires POSIX permissions")
+    def test_directory_permissions(self):
+        os.makedirs(self.directory, mode=0o700)
+        ConfigCache(self.directory)
+        os.chmod(self.directory, 0o777)
+        self.assertRaises(errors.ConfigError, ConfigCache, self.directory)
+        os.chmod(self.directory, 0o755)
+        ConfigCache(self.directory)
+        link = os.path.join(self.tempdir.name, "link")
+        os.symlink(self.directory, link)
+        self.assertRaises(errors.ConfigError, ConfigCache, link)
+
+    def test_evict(self):
+        cache = ConfigCache(self.directory, max_size=None, max_age=60)
+        cache.load(self.filename)
+        cache.load(self.filename, pickname="test")
+        entries = cache.entries()
+        self.assertEqual(len(entries), 2)
+        past = time.time() - 120
+        os.utime(entries[0][2], (past, past))
+        cache.evict()
+        self.assertEqual(len(cache.entries()), 1)
+
+        cache.load(self.filename, pickname="test.b")
+        cache.max_size = max(item[1] for item in cache.entries())
+        cache.evict()
+        self.assertEqual(len(cache.entries()), 1)
+
+    def test_getconfig(self):
+        config = getconfig(
+            schema={"test": {"a": 0, "b": {"c": ""}}},
+            values=self.filename,
+            pickname="test",
+            cache=self.directory)
+        self.assertEqual(config.a, 12)
+        self.assertEqual(config.b.c, "hello")
+        self.assertEqual(len(ConfigCache(self.directory).entries()), 1)
+        schema = getschema(cache=self.directory)
+        self.assertDictEqual(schema, getschema())
@@ -0,0 +1,86 @@
+import unittest
+from pyconfigmanager.cli import main
+import io
+import json
+import os
+import tempfile
+
+
+class TestCli(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.schema = self.write(
+            "schema.yaml", "port:\n  .type: int\n  .max: 100\n  .value: 8\n"
+            "  .help: the port\nname: x\n")
+        self.bad = self.write("bad.yaml", "port: 200\n")
+        self.good = self.write("good.json", '{"port": 20, "name": "y"}')
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def write(self, name, contents):
+        filename = os.path.join(self.tempdir.name, name)
+        with open(filename, "w") as stream:
+            stream.write(contents)
+        return filename
+
+    def run_main(self, *argv):
+        output = io.StringIO()
+        status = main(list(argv), output=output)
+        return status, output.getvalue()
+
+    def test_validate(self):
+        status, output = self.run_main("validate", "-s", self.schema,
+                                       self.bad, self.good)
+        self.assertEqual(status, 1)
+        self.assertEqual(
+            output, "{}: port: 'Options' object: attribute 'value': "
+            "'200' required <= 100\n{}: ok\n".format(self.bad, self.good))
+        status, output = self.run_main("validate", "-s", self.schema,
+                                       "--format", "json", "-j", "2",
+                                       self.bad, self.good)
+        self.assertEqual(status, 1)
+        results = {item["filename"]: item for item in json.loads(output)}
+        self.assertFalse(results[self.bad]["valid"])
+        self.assertEqual(results[self.bad]["violations"][0]["kind"], "max")
+        self.assertTrue(results[self.good]["valid"])
+        self.assertTupleEqual(
+            self.run_main("validate", "-s", self.schema), (0, "schema: ok\n"))
+
+    def test_dump(self):
+        status, output = self.run_main("dump", "-s", self.schema, "--format",
+                                       "json", self.good)
+        self.assertEqual(status, 0)
+        self.assertDictEqual(json.loads(output), {"port": 20, "name": "y"})
+        filename = os.path.join(self.tempdir.name, "dump.yaml")
+        self.assertTupleEqual(
+            self.run_main("dump", "-s", self.schema, "-o", filename,
+                          self.bad), (0, ""))
+        with open(filename) as stream:
+            self.assertEqual(stream.read(), "name: x\nport: 200\n")
+
+    def test_diff(self):
+        status, output = self.run_main("diff", "-s", self.schema, self.bad,
+                                       self.good)
+        self.assertEqual(status, 1)
+        self.assertEqual(output, "port: 200 -> 20\nname: 'x' -> 'y'\n")
+        self.assertTupleEqual(
+            self.run_main("diff", "-s", self.schema, self.bad, self.bad),
+            (0, ""))
+
+    def test_explain(self):
+        status, output = self.run_main("explain", "-s", self.schema,
+                                       "--format", "json", "port", self.bad,
+                                       self.good)
+        self.assertEqual(status, 0)
+        result = json.loads(output)
+        self.assertEqual(result["source"], self.good)
+        self.assertEqual(result["value"], 20)
+        self.assertEqual(result["type"], "int")
+        self.assertEqual(result["argument"], "--port")
+        status, output = self.run_main("explain", "-s", self.schema, "name")
+        self.assertEqual(status, 0)
+        self.assertIn("source: schema\n", output)
+        self.assertEqual(
+            self.run_main("explain", "-s", self.schema, "missing"),
+            (1, "missing: no such path\n"))
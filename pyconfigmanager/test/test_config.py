@@ -1,7 +1,14 @@
 import unittest
-from pyconfigmanager.config import Config
+from pyconfigmanager.config import Config, load_snapshot, thaw
+from pyconfigmanager.config import LazyArgumentParser
+from pyconfigmanager import errors
 from pyconfigmanager.options import Options
 from pyconfigmanager import utils
+import argparse
+import contextlib
+import copy
+import io
+import pickle
 import os
 import tempfile
 
@@ -206,6 +213,125 @@ class TestConfig(unittest.TestCase):
         self.assertEqual(config.a, 56)
         self.assertEqual(config.b, "100")
 
+    def test_path_index(self):
+        config = Config({"a": 1, "db": {"pool": {"size": 4}}, "a_b": 3})
+        self.assertEqual(config["db.pool.size"], 4)
+        self.assertIsInstance(config.getitem("db.pool", raw=True), Config)
+        self.assertIs(
+            config.path_index()["db.pool.size"],
+            config.db.pool.getattr("size", raw=True))
+        self.assertRaises(KeyError, config.getitem, "db.pool.none")
+        config["db.pool.size"] = "8"
+        self.assertEqual(config.db.pool.size, "8")
+        config.db.setattr("pool", {"size": 16, "timeout": 1.5}, raw=True)
+        self.assertEqual(config["db.pool.size"], 16)
+        self.assertEqual(config["db.pool.timeout"], 1.5)
+        del config.db["pool"]
+        self.assertRaises(KeyError, config.getitem, "db.pool.size")
+        self.assertNotIn("db.pool", config.path_index())
+        self.assertRaises(KeyError, config.setitem, "a.b", 1)
+
+        config = Config({"a": {"b": 1}, "a_b": 3, "c": {"d_e": 2}})
+        index = config.argument_index()
+        self.assertIs(index["a_b"], config.getattr("a_b", raw=True))
+        self.assertIs(index["c_d_e"], config.c.getattr("d_e", raw=True))
+        self.assertNotIn("c_d", index)
+
+    def test_path_index_version(self):
+        config = Config({"a": 1, "db": {"pool": {"size": 4}}})
+        index = config.path_index()
+        Config({"x": 1})
+        other = Config({"y": {"z": 1}})
+        del other.y["z"]
+        self.assertIs(config.path_index(), index)
+        pool_index = config.db.pool.path_index()
+        config.db.setattr("user", "root", raw=True)
+        self.assertIsNot(config.path_index(), index)
+        self.assertEqual(config["db.user"], "root")
+        self.assertIs(config.db.pool.path_index(), pool_index)
+        pool = config.db.pool
+        del config.db["pool"]
+        index = config.path_index()
+        pool.setattr("timeout", 1, raw=True)
+        self.assertIs(config.path_index(), index)
+
+        other = Config({"b": 1})
+        config.setattr("pool", pool, raw=True)
+        self.assertRaises(errors.ConfigError, other.setattr, "pool", pool,
+                          True)
+        config.setattr("pool", pool, raw=True)
+        other.setattr("pool", pool.copy(), raw=True)
+        self.assertEqual(other["pool.timeout"], 1)
+        config.setattr("pool", {"size": 2}, raw=True)
+        other.setattr("old", pool, raw=True)
+        index = config.path_index()
+        pool.setattr("retries", 3, raw=True)
+        self.assertIs(config.path_index(), index)
+        self.assertEqual(other["old.retries"], 3)
+
+    def test_changes(self):
+        config = Config({"a": 1, "b": {"c": "x", "d": [1]}, "e": 1.5})
+        self.assertRaises(errors.ConfigError, config.changes)
+        config.checkpoint()
+        self.assertDictEqual(config.changes(), {})
+        config.update_values({"a": "2", "b": {"c": "x", "d": [2]}})
+        config.a = 3
+        self.assertDictEqual(config.changes(), {
+            "a": (1, 3),
+            "b.d": ([1], [2])
+        })
+        config.e = 2.5
+        config.e = 1.5
+        self.assertNotIn("e", config.changes())
+        config.getattr("e", raw=True).type = "int"
+        self.assertDictEqual(
+            config.changes(reset=True), {
+                "a": (1, 3),
+                "b.d": ([1], [2]),
+                "e": (1.5, 1)
+            })
+        self.assertDictEqual(config.changes(), {})
+
+        old_leaf = config.b.getattr("c", raw=True)
+        config.b["f"] = 12
+        config.b["c"] = "y"
+        self.assertDictEqual(config.changes(), {
+            "b.f": (None, 12),
+            "b.c": ("x", "y")
+        })
+        self.assertIsNone(old_leaf._watchers)
+        config.checkpoint()
+        config.b.f = 13
+        self.assertDictEqual(config.changes(), {"b.f": (12, 13)})
+
+    def test_changes_removed(self):
+        config = Config({"a": 1, "b": {"c": "x", "d": [1]}})
+        config.checkpoint()
+        del config.b["c"]
+        config.b["c"] = "y"
+        self.assertDictEqual(config.changes(), {"b.c": ("x", "y")})
+        config.checkpoint()
+        config.a = 2
+        del config["a"]
+        del config["b"]
+        self.assertDictEqual(config.changes(), {
+            "a": (1, None),
+            "b.c": ("y", None),
+            "b.d": ([1], None)
+        })
+        config.checkpoint()
+        config["e"] = 3
+        self.assertDictEqual(config.changes(), {"e": (None, 3)})
+        del config["e"]
+        self.assertDictEqual(config.changes(), {})
+        config["b"] = {"d": [1]}
+        self.assertDictEqual(config.changes(reset=True), {"b.d": (None, [1])})
+        config.b["d"] = {"x": 1}
+        self.assertDictEqual(config.changes(), {
+            "b.d": ([1], None),
+            "b.d.x": (None, 1)
+        })
+
     def test_delitem(self):
         config = Config({"a": 12, "b": 34})
         self.assertIn("a", config)
@@ -421,6 +547,83 @@ class TestConfig(unittest.TestCase):
         self.assertIsInstance(config.d.getattr("f", raw=True), Options)
         self.assertEqual(config.d.f, 12)
 
+    def test_update_schema_changes(self):
+        schema = {
+            "a": 1,
+            "b": {
+                ".type": "int",
+                ".value": "2",
+                "help": "b"
+            },
+            "c": {
+                "d": {
+                    "e": "x",
+                    "f": [1]
+                },
+                "g": {
+                    ".value": 1.5,
+                    "argoptions": {
+                        "nargs": 2
+                    }
+                },
+            },
+        }
+        config = Config(schema)
+        self.assertListEqual(config.update_schema(schema, merge=True), [])
+        self.assertListEqual(
+            config.update_schema(
+                {
+                    "a": {
+                        ".value": "1",
+                        "type": "int"
+                    },
+                    "b": {
+                        ".help": "b",
+                        "value": 2,
+                        "max": 3
+                    },
+                    "c": {
+                        "d": {
+                            "e": "y",
+                            "f": None
+                        },
+                        "g": {
+                            ".argoptions": {
+                                "nargs": 2
+                            }
+                        },
+                        "h": 12,
+                    },
+                },
+                merge=True), ["b", "c.d.e", "c.h"])
+        self.assertEqual(config.getattr("b", raw=True).max, 3)
+        self.assertListEqual(
+            config.update_schema({"b": {".max": "3", "help": "b"}}), [])
+        self.assertFalse(
+            config.getattr("b", raw=True).merge_values({"value": "2"}))
+        self.assertEqual(config.c.d.e, "y")
+        self.assertEqual(config.c.d.f, [1])
+        self.assertListEqual(
+            config.update_schema({
+                "a": {
+                    "b": 1
+                },
+                "c": {
+                    "g": {
+                        ".type": "int",
+                        ".value": "abc"
+                    }
+                }
+            }), ["a", "c.g"])
+        self.assertIsInstance(config.a, Config)
+        self.assertEqual(config.c.getattr("g", raw=True).type, "int")
+        self.assertEqual(config.c.g, 1)
+        self.assertRaises(AttributeError, config.update_schema,
+                          {"b": {".unknown": 1}})
+        self.assertListEqual(
+            config.c.update_schema(None, merge=False, parentnames=["c"]),
+            ["c.d", "c.g", "c.h"])
+
     def test_assert_values(self):
         config = Config({
             "a": 12,
@@ -506,6 +709,160 @@ class TestConfig(unittest.TestCase):
         self.assertEqual(config.a.b, 1)
         self.assertEqual(config.a_b, 12)
 
+    def test_lazy_argument_parser(self):
+        populated = []
+
+        class CountingConfig(Config):
+            def argument_parser(self, *args, **kwargs):
+                populated.append(kwargs.get("parentnames", []))
+                return super().argument_parser(*args, **kwargs)
+
+        schema = {
+            "command": "",
+            "a": {
+                "x": 1,
+                "c": {
+                    "y": 2
+                }
+            },
+            "b": {
+                "z": 3
+            },
+            "v": 0,
+        }
+        config = Config(schema)
+        object.__setattr__(config, "__class__", CountingConfig)
+        for name in ("a", "b"):
+            object.__setattr__(
+                config.getattr(name, raw=True), "__class__", CountingConfig)
+        subcommands = {"a": ("c", ), "b": ()}
+        parser = config.argument_parser(subcommands=subcommands)
+        self.assertListEqual(populated, [[]])
+        self.assertIn("{a,b}", parser.format_help())
+        self.assertListEqual(populated, [[]])
+
+        args = parser.parse_args(["--v", "5", "a", "--x", "6"])
+        self.assertListEqual(populated, [[], ["a"]])
+        self.assertEqual(args.v, 5)
+        self.assertEqual(args.x, 6)
+        parser.parse_args(["a", "c", "--y", "7"])
+        self.assertListEqual(populated, [[], ["a"]])
+        self.assertEqual(
+            vars(parser.parse_args(["a", "c", "--y", "7"])), {
+                "command": "a.c",
+                "v": 0,
+                "x": 1,
+                "y": 7,
+            })
+
+        eager = Config(schema).argument_parser(
+            subcommands=subcommands, lazy=False)
+        for arguments in (["b", "--z", "8"], ["--v", "5", "a", "--x", "6"]):
+            self.assertEqual(
+                vars(eager.parse_args(arguments)),
+                vars(parser.parse_args(arguments)))
+        self.assertIsInstance(
+            parser._subparsers._group_actions[0].choices["a"],
+            LazyArgumentParser)
+        self.assertNotIsInstance(
+            eager._subparsers._group_actions[0].choices["a"],
+            LazyArgumentParser)
+
+        parser = Config(schema).argument_parser(subcommands=subcommands)
+        self.assertIsInstance(parser, LazyArgumentParser)
+        parser.materialize(["--v", "5", "a", "c"])
+        self.assertIsNone(parser.commands["a"].populate)
+        self.assertIsNone(parser.commands["a"].commands["c"].populate)
+        self.assertIsNotNone(parser.commands["b"].populate)
+
+        parser = Config(schema).argument_parser(subcommands=subcommands)
+        for arguments, option in ((["a", "-h"], "--x"),
+                                  (["a", "c", "--help"], "--y"),
+                                  (["b", "-h"], "--z")):
+            output = io.StringIO()
+            with self.assertRaises(SystemExit):
+                with contextlib.redirect_stdout(output):
+                    parser.parse_args(arguments)
+            self.assertIn(option, output.getvalue())
+        output = io.StringIO()
+        parser = Config(schema).argument_parser(subcommands=subcommands)
+        parser.commands["a"].print_help(output)
+        self.assertIn("--x", output.getvalue())
+        self.assertIsNotNone(parser.commands["b"].populate)
+
+    def test_update_values_by_arguments_index(self):
+        config = Config({
+            "command": "",
+            "a": {
+                "b_c": 1,
+                "d": {
+                    "e": 2
+                }
+            },
+            "b": {
+                "c": 3
+            },
+            "d_e": 4,
+        })
+        parser = config.argument_parser(subcommands=("a", ))
+        self.assertRaises(errors.ConfigError, parser.parse_args,
+                          ["--b-c", "30", "a", "--b_c", "10"])
+        self.assertRaises(errors.ConfigError, config.argument_parser,
+                          subcommands=("a", ), lazy=False)
+        self.assertRaises(errors.ConfigError, Config({
+            "b": {
+                "c": 1
+            },
+            "b_c": 2
+        }).argument_parser)
+
+        config = Config({
+            "command": "",
+            "a": {
+                "f_g": 1,
+                "d": {
+                    "e": 2
+                }
+            },
+            "b": {
+                "c": 3
+            },
+            "e": 4,
+        })
+        parser = config.argument_parser(subcommands=("a", ))
+        args = parser.parse_args(
+            ["--b-c", "30", "--e", "40", "a", "--f_g", "10", "--d-e", "20"])
+        self.assertIsNone(config.getattr("_index"))
+        self.assertIsNone(config.a.getattr("_index"))
+        config.update_values_by_arguments(args, subcommands=("a", ))
+        self.assertNotIn("a_f_g", config.argument_index(ignores=("a", )))
+        self.assertIsNotNone(config.a.getattr("_index"))
+        self.assertIsNone(config.b.getattr("_index"))
+        self.assertDictEqual(config.values(), {
+            "command": "a",
+            "a": {
+                "f_g": 10,
+                "d": {
+                    "e": 20
+                }
+            },
+            "b": {
+                "c": 30
+            },
+            "e": 40,
+        })
+
+        config.update_values_by_arguments({"a_f_g": 11, "e": 41},
+                                          subcommands=("a", ))
+        self.assertEqual(config.a.f_g, 11)
+        self.assertEqual(config.e, 41)
+        config.update_values_by_arguments(
+            {"command": "", "a_d_e": 21}, subcommands=("a", ))
+        self.assertEqual(config.a.d.e, 21)
+        self.assertRaises(AttributeError, config.update_values_by_arguments,
+                          {"x": 1}, subcommands=("a", ),
+                          ignore_not_found=False)
+
     def test_update_values_by_arguments(self):
         config = Config({"a": 12, "b": 13, "c": {"d": {"e": 45}}})
         config.update_values_by_arguments(
@@ -811,6 +1168,149 @@ class TestConfig(unittest.TestCase):
         os.remove(jsonfile)
         os.remove(yamlfile)
 
+    def test_update_argument_defaults(self):
+        config = Config({
+            "a": 1,
+            "b": {
+                "c": "x"
+            },
+            "d": {
+                "e": 2
+            },
+            "command": "",
+        })
+        parser = config.argument_parser(subcommands=("d", ))
+        config.update_values({"a": 3, "b": {"c": "y"}, "d": {"e": 4}})
+        self.assertIs(
+            config.update_argument_defaults(parser, subcommands=("d", )),
+            parser)
+        args = parser.parse_args(["d"])
+        self.assertEqual(args.a, 3)
+        self.assertEqual(args.b_c, "y")
+        self.assertEqual(args.e, 4)
+        args = parser.parse_args(["--a", "5", "d", "--e", "6"])
+        self.assertEqual(args.a, 5)
+        self.assertEqual(args.e, 6)
+
+    def test_update_values_by_argument_parser_reuse(self):
+        built = []
+
+        class CountingConfig(Config):
+            def argument_parser(self, *args, **kwargs):
+                built.append(args)
+                return super().argument_parser(*args, **kwargs)
+
+        with tempfile.NamedTemporaryFile("w", suffix=".yaml") as stream:
+            stream.write("a: 5\nb: 6\nd:\n  e: 7\n  f: 8\n")
+            stream.flush()
+            config = CountingConfig({
+                "a": 1,
+                "b": 2,
+                "d": {
+                    "e": 3,
+                    "f": 4
+                },
+                "config": {
+                    "file": ""
+                },
+                "command": "",
+            })
+            parser = argparse.ArgumentParser()
+            parser.add_argument("--extra", default="z")
+            args = config.update_values_by_argument_parser(
+                parser=parser,
+                arguments=[
+                    "--b", "9", "--config-file", stream.name, "d", "--f", "10"
+                ],
+                subcommands=("d", ))
+        self.assertEqual(len(built), 1)
+        self.assertEqual(args.extra, "z")
+        self.assertDictEqual(config.values(), {
+            "a": 5,
+            "b": 9,
+            "d": {
+                "e": 7,
+                "f": 10
+            },
+            "config": {
+                "file": stream.name
+            },
+            "command": "d",
+        })
+
+    def test_update_values_by_argument_parser_single_pass(self):
+        built = []
+
+        class CountingConfig(Config):
+            def argument_parser(self, *args, **kwargs):
+                built.append(args)
+                return super().argument_parser(*args, **kwargs)
+
+        schema = {
+            "a": 1,
+            "b": 2,
+            "d": {
+                "e": 3,
+                "f": 4
+            },
+            "config": {
+                "file": ""
+            },
+            "command": "",
+        }
+        with tempfile.NamedTemporaryFile("w", suffix=".yaml") as stream:
+            stream.write("a: 5\nb: 6\nd:\n  e: 7\n  f: 8\n")
+            stream.flush()
+            for arguments in (["--config-file", stream.name],
+                              ["--config-file=" + stream.name]):
+                config = CountingConfig(schema)
+                config.update_values_by_argument_parser(
+                    arguments=["--b", "9"] + arguments + ["d", "--f", "10"],
+                    subcommands=("d", ),
+                    single_pass=True)
+                self.assertEqual(len(built), 1)
+                built.clear()
+                self.assertDictEqual(config.values(), {
+                    "a": 5,
+                    "b": 9,
+                    "d": {
+                        "e": 7,
+                        "f": 10
+                    },
+                    "config": {
+                        "file": stream.name
+                    },
+                    "command": "d",
+                })
+
+            config = Config(schema)
+            config.config.file = stream.name
+            config.update_values_by_argument_parser(
+                arguments=["--a", "0"], single_pass=True)
+            self.assertEqual(config.a, 0)
+            self.assertEqual(config.b, 6)
+
+            config = Config(schema)
+            with self.assertRaises(SystemExit):
+                with contextlib.redirect_stderr(io.StringIO()):
+                    config.update_values_by_argument_parser(
+                        arguments=["--config-fi", stream.name],
+                        single_pass=True)
+            self.assertEqual(config.a, 1)
+            parser = argparse.ArgumentParser()
+            config = Config(schema)
+            config.update_values_by_argument_parser(
+                parser=parser,
+                arguments=["--config-file", stream.name],
+                single_pass=True)
+            self.assertFalse(parser.allow_abbrev)
+            self.assertEqual(config.a, 5)
+
+        config = Config(schema)
+        config.update_values_by_argument_parser(
+            arguments=["--a", "0"], single_pass=True)
+        self.assertDictEqual(config.values(), dict(schema, a=0))
+
     def test_update_values_by_argument_parser(self):
         filedir = os.path.join(
             os.path.dirname(os.path.abspath(__file__)), "files")
@@ -956,3 +1456,373 @@ class TestConfig(unittest.TestCase):
         self.assertEqual(config.g.f.h.i, 123)
         self.assertEqual(config.g.f.d, "123")
         self.assertEqual(config.g.d, "qwe")
+
+    def test_snapshot(self):
+        config = Config({
+            "a": 1,
+            "b": {
+                ".type": "float",
+                ".value": "1.5",
+                ".max": 3,
+                ".help": "float value",
+            },
+            "c": {
+                "d": [1, 2],
+                "e": {
+                    ".type": list,
+                    "argoptions": {
+                        "type": int,
+                        "nargs": 2
+                    }
+                },
+                "f": {
+                    ".value": "x",
+                    "argoptions": False
+                },
+            },
+        })
+        data = config.dump_snapshot()
+        restored = load_snapshot(data)
+        self.assertIsInstance(restored, Config)
+        self.assertEqual(repr(restored.schema()), repr(config.schema()))
+        self.assertDictEqual(restored.values(), config.values())
+        self.assertEqual(restored["c.d"], [1, 2])
+        restored.b = "2.5"
+        self.assertEqual(restored.b, 2.5)
+        self.assertEqual(config.b, 1.5)
+        argoptions = restored.c.getattr("e", raw=True).argument_options()
+        self.assertDictEqual(
+            argoptions,
+            config.c.getattr("e", raw=True).argument_options())
+        self.assertEqual(
+            restored.argument_parser().parse_args(
+                ["--c-e", "3", "4"]).c_e, [3, 4])
+
+        with tempfile.NamedTemporaryFile(suffix=".snapshot") as temp_file:
+            config.dump_snapshot(filename=temp_file.name)
+            restored = load_snapshot(temp_file.name)
+        self.assertEqual(repr(restored.schema()), repr(config.schema()))
+        self.assertRaises(errors.ConfigError, load_snapshot, b"PCMS\x00")
+
+    def test_copy(self):
+        config = Config({"a": 1, "b": {"c": [1, 2], "d": "x"}})
+        copied = config.copy()
+        self.assertIsNot(copied, config)
+        self.assertDictEqual(copied.values(), config.values())
+        copied.b.c.append(3)
+        copied.a = 2
+        self.assertEqual(config.b.c, [1, 2])
+        self.assertEqual(config.a, 1)
+
+    def test_deepcopy(self):
+        config = Config({
+            "a": 1,
+            "b": {
+                "c": [1, 2],
+                "d": {
+                    ".type": "int",
+                    ".value": 3,
+                    ".argoptions": {
+                        "short": "d"
+                    }
+                }
+            }
+        })
+        config.validate()
+        copied = copy.deepcopy(config)
+        self.assertIsNot(copied, config)
+        self.assertDictEqual(copied.values(), config.values())
+        self.assertEqual(repr(copied.schema()), repr(config.schema()))
+        copied.b.c.append(3)
+        copied.b.d = "4"
+        self.assertEqual(copied.b.d, 4)
+        self.assertEqual(config.b.c, [1, 2])
+        self.assertEqual(config.b.d, 3)
+        self.assertEqual(copied.path_index()["b.d"].value, 4)
+        self.assertListEqual(copied.validate().paths(), [])
+
+        frozen = copy.deepcopy(config.copy().freeze())
+        self.assertIsInstance(frozen.b, type(config.copy().freeze()))
+        self.assertEqual(frozen.values(), config.values())
+        self.assertRaises(errors.ConfigError, setattr, frozen, "a", 2)
+
+    def test_pickle(self):
+        config = Config({
+            "a": 1,
+            "b": {
+                "c": [1, 2],
+                "d": {
+                    ".type": "int",
+                    ".value": 3,
+                    ".argoptions": {
+                        "short": "d"
+                    }
+                }
+            }
+        })
+        config.validate()
+        restored = pickle.loads(pickle.dumps(config))
+        self.assertDictEqual(restored.values(), config.values())
+        self.assertEqual(repr(restored.schema()), repr(config.schema()))
+        restored.b.d = "4"
+        self.assertEqual(restored.b.d, 4)
+
+        frozen = pickle.loads(pickle.dumps(config.copy().freeze()))
+        self.assertEqual(frozen.values(), config.values())
+        self.assertRaises(errors.ConfigError, setattr, frozen.b, "d", 2)
+        self.assertRaises(errors.ConfigError, setattr,
+                          frozen.b.getattr("d", raw=True), "value", 2)
+
+    def test_freeze(self):
+        config = Config({
+            "a": 1,
+            "b": {
+                "c": {
+                    ".value": [1, 2],
+                    "argoptions": {
+                        "nargs": 2
+                    }
+                },
+                "d": "x"
+            }
+        })
+        frozen = config.copy().freeze()
+        self.assertIsInstance(frozen, Config)
+        self.assertIsInstance(frozen.getattr("a", raw=True), Options)
+        self.assertIs(frozen.freeze(), frozen)
+        self.assertEqual(frozen.values(), config.values())
+        self.assertEqual(frozen["b.c"], [1, 2])
+        self.assertEqual(frozen.argument_index()["b_d"].value, "x")
+        with self.assertRaises(errors.ConfigError):
+            frozen.a = 2
+        with self.assertRaises(errors.ConfigError):
+            frozen["b.d"] = "y"
+        with self.assertRaises(errors.ConfigError):
+            frozen.b.getattr("d", raw=True).value = "y"
+        with self.assertRaises(errors.ConfigError):
+            frozen.b.getattr("c", raw=True).argoptions.nargs = 3
+        with self.assertRaises(errors.ConfigError):
+            del frozen.a
+        with self.assertRaises(errors.ConfigError):
+            frozen.update_values({"a": 2})
+        with self.assertRaises(errors.ConfigError):
+            frozen.update_schema({"e": 1})
+        self.assertEqual(frozen.a, 1)
+        self.assertNotIn("e", frozen)
+        with self.assertRaises(errors.ConfigError):
+            frozen.b.c.append(3)
+        with self.assertRaises(errors.ConfigError):
+            frozen.values()["b"]["c"][0] = 3
+        self.assertListEqual(frozen.b.c, [1, 2])
+        self.assertIsInstance(frozen.b.c, list)
+        self.assertListEqual(frozen.validate().paths(), [])
+
+        items = [1, {"x": [2]}]
+        frozen = Config({"e": items}).freeze()
+        with self.assertRaises(errors.ConfigError):
+            frozen.e[1]["x"].append(3)
+        with self.assertRaises(errors.ConfigError):
+            frozen.e[1]["y"] = 3
+        items[1]["x"].append(3)
+        self.assertEqual(frozen.e, [1, {"x": [2]}])
+        thawed = frozen.copy()
+        thawed.e[1]["x"].append(4)
+        self.assertEqual(thawed.e, [1, {"x": [2, 4]}])
+        self.assertIs(type(thaw(frozen.values())["e"][1]), dict)
+        restored = pickle.loads(pickle.dumps(frozen))
+        with self.assertRaises(errors.ConfigError):
+            restored.e.append(3)
+        frozen = config.copy().freeze()
+
+        self.assertIs(frozen.values(), frozen.values())
+        self.assertIs(frozen.values()["b"], frozen.b.values())
+        self.assertEqual(repr(frozen), str(config.values()))
+        self.assertIs(repr(frozen), repr(frozen))
+        self.assertEqual(repr(thaw(frozen.schema())), repr(config.schema()))
+        self.assertIs(frozen.schema(), frozen.schema())
+        self.assertIs(frozen.schema("b"), frozen.schema()["b"])
+        self.assertEqual(
+            repr(thaw(frozen.schema(["a"]))), repr(config.schema(["a"])))
+        self.assertRaises(AttributeError, frozen.schema, "e")
+        with self.assertRaises(TypeError):
+            frozen.values()["a"] = 99
+        with self.assertRaises(TypeError):
+            frozen.values()["b"]["d"] = "y"
+        with self.assertRaises(TypeError):
+            frozen.schema()["a"][".value"] = 99
+        with self.assertRaises(TypeError):
+            frozen.schema()["b"]["c"][".help"] = "c"
+        self.assertEqual(frozen.values()["a"], 1)
+        self.assertEqual(repr(frozen), str(config.values()))
+        self.assertDictEqual(
+            Config(frozen.schema()).values(), config.values())
+        thawed = Config(config.schema())
+        thawed.update_values(frozen.values())
+        self.assertEqual(thawed.values(), config.values())
+
+        thawed = frozen.copy()
+        thawed.a = 2
+        self.assertEqual(thawed.a, 2)
+        self.assertEqual(frozen.a, 1)
+
+    def test_accessor(self):
+        config = Config({
+            "db": {
+                "pool": {
+                    "size": 4,
+                    "_0": "x"
+                },
+                "host": "localhost"
+            },
+            "debug": False
+        })
+        accessor = config.accessor()
+        self.assertIs(config.accessor(), accessor)
+        self.assertEqual(accessor.db.pool.size, 4)
+        self.assertEqual(getattr(accessor.db.pool, "_0"), "x")
+        self.assertEqual(accessor.db.host, "localhost")
+        self.assertIs(accessor.debug, False)
+        self.assertEqual(repr(accessor), str(config.values()))
+        self.assertRaises(AttributeError, getattr, accessor, "missing")
+        self.assertRaises(AttributeError, setattr, accessor, "missing", 1)
+        self.assertRaises(AttributeError, setattr, accessor, "db", 1)
+
+        config.db.pool.size = 8
+        self.assertEqual(accessor.db.pool.size, 8)
+        accessor.db.pool.size = "16"
+        self.assertEqual(config.db.pool.size, 16)
+        self.assertIs(
+            type(Config({"size": 1, "_0": 2}).accessor()),
+            type(accessor.db.pool))
+
+        config.update_schema({"db": {"port": 5432}})
+        accessor = config.accessor()
+        self.assertEqual(accessor.db.port, 5432)
+
+        frozen = config.copy().freeze()
+        self.assertEqual(frozen.accessor().db.pool.size, 16)
+        with self.assertRaises(errors.ConfigError):
+            frozen.accessor().db.pool.size = 1
+        Config({"a": 1}).update_schema({"b": 2})
+        self.assertIs(frozen.accessor(), frozen.accessor())
+
+    def test_namedtuple(self):
+        config = Config({
+            "db": {
+                "pool": {
+                    "size": 4
+                },
+                "hosts": ["a", "b"],
+                "class": "x",
+            },
+            "debug": False,
+            "timeout": {
+                ".type": "float"
+            },
+        })
+        view = config.namedtuple()
+        self.assertIsInstance(view, tuple)
+        self.assertEqual(view.db.pool.size, 4)
+        self.assertListEqual(view.db.hosts, ["a", "b"])
+        self.assertEqual(view.db[2], "x")
+        self.assertIs(view.debug, False)
+        self.assertIsNone(view.timeout)
+        self.assertRaises(AttributeError, setattr, view, "debug", True)
+        annotations = type(view).__annotations__
+        self.assertIs(annotations["debug"], bool)
+        self.assertIs(annotations["timeout"], float)
+        self.assertIs(annotations["db"], type(view.db))
+        self.assertIs(type(view.db.pool).__annotations__["size"], int)
+
+        config.db.pool.size = 8
+        self.assertEqual(view.db.pool.size, 4)
+        updated = config.namedtuple()
+        self.assertEqual(updated.db.pool.size, 8)
+        self.assertIs(type(updated), type(view))
+
+        config.update_schema({"db": {"port": 5432}})
+        self.assertIsNot(type(config.namedtuple()), type(view))
+        self.assertEqual(config.namedtuple().db.port, 5432)
+
+        frozen = config.copy().freeze()
+        self.assertIs(frozen.namedtuple(), frozen.namedtuple())
+        self.assertEqual(frozen.namedtuple(), config.namedtuple())
+
+    def test_update_values_by_environ(self):
+        config = Config({
+            "db": {
+                "pool": {
+                    "size": 4
+                },
+                "hosts": ["a"],
+                "options": {
+                    ".type": "dict"
+                },
+            },
+            "debug": False,
+            "ratio": 0.5,
+            "name": "x",
+            "log-level": "info",
+        })
+        environ = {
+            "APP_DB_POOL_SIZE": "8",
+            "APP_DB_HOSTS": "[b, c]",
+            "APP_DB_OPTIONS": "{timeout: 3}",
+            "APP_DEBUG": "yes",
+            "APP_RATIO": "1.5",
+            "APP_LOG_LEVEL": "debug",
+            "APP_MISSING": "1",
+            "DB_POOL_SIZE": "16",
+            "PATH": "/bin",
+        }
+        changes = config.update_values_by_environ("APP", environ=environ)
+        self.assertListEqual(
+            sorted(changes),
+            ["db.hosts", "db.options", "db.pool.size", "debug", "log-level",
+             "ratio"])
+        self.assertDictEqual(config.values(), {
+            "db": {
+                "pool": {
+                    "size": 8
+                },
+                "hosts": ["b", "c"],
+                "options": {
+                    "timeout": 3
+                },
+            },
+            "debug": True,
+            "ratio": 1.5,
+            "name": "x",
+            "log-level": "debug",
+        })
+        index = config.environ_index("APP")
+        self.assertIs(config.environ_index("APP"), index)
+        config.update_values_by_environ(
+            "APP", environ={"APP_DB_HOSTS": "d, e"})
+        self.assertListEqual(config.db.hosts, ["d", "e"])
+        self.assertRaises(ValueError, config.update_values_by_environ, "",
+                          environ=environ)
+        self.assertRaises(ValueError, config.environ_index, None)
+        self.assertEqual(config.db.pool.size, 8)
+
+        config.update_schema({"port": 80})
+        self.assertIsNot(config.environ_index("APP"), index)
+        config.update_values_by_environ("APP", environ={"APP_PORT": "81"})
+        self.assertEqual(config.port, 81)
+
+    def test_update_values_by_argument_parser_environ(self):
+        config = Config({"a": 1, "b": 2, "config": {"file": ""}})
+        os.environ["PYCONFIGMANAGER_TEST_A"] = "3"
+        os.environ["PYCONFIGMANAGER_TEST_B"] = "4"
+        try:
+            for single_pass in (False, True):
+                config.update_values({"a": 1, "b": 2})
+                config.update_values_by_argument_parser(
+                    arguments=["--a", "5"],
+                    environ_prefix="PYCONFIGMANAGER_TEST",
+                    single_pass=single_pass)
+                self.assertEqual(config.a, 5)
+                self.assertEqual(config.b, 4)
+        finally:
+            del os.environ["PYCONFIGMANAGER_TEST_A"]
+            del os.environ["PYCONFIGMANAGER_TEST_B"]
@@ -1,5 +1,6 @@
 import unittest
 from pyconfigmanager import getconfig
+from pyconfigmanager import errors
 import os
 
 
@@ -33,3 +34,21 @@ class TestGlobal(unittest.TestCase):
         self.assertEqual(config.c.d, 67)
         self.assertEqual(config.c.e, "hell")
         self.assertEqual(config.e, 12)
+
+    def test_getconfig_freeze(self):
+        config = getconfig(schema={"a": 1, "b": {"c": "x"}}, freeze=True)
+        self.assertEqual(config.values(), {"a": 1, "b": {"c": "x"}})
+        self.assertRaises(errors.ConfigError, setattr, config, "a", 2)
+
+    def test_getconfig_environ(self):
+        os.environ["PYCONFIGMANAGER_TEST_B_C"] = "y"
+        try:
+            config = getconfig(
+                schema={"a": 1, "b": {"c": "x"}},
+                values={"a": 2, "b": {"c": "z"}},
+                environ_prefix="PYCONFIGMANAGER_TEST")
+        finally:
+            del os.environ["PYCONFIGMANAGER_TEST_B_C"]
+        self.assertDictEqual(config.values(), {"a": 2, "b": {"c": "y"}})
+        self.assertRaises(ValueError, getconfig, schema={"path": "/"},
+                          environ_prefix="")
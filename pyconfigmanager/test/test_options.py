@@ -1,6 +1,9 @@
 import unittest
 from pyconfigmanager.options import BasicOptions, ArgumentOptions, Options
 from pyconfigmanager.options import str2bool
+from pyconfigmanager import errors
+import copy
+import pickle
 
 
 class TestBasicOptions(unittest.TestCase):
@@ -17,6 +20,14 @@ class TestBasicOptions(unittest.TestCase):
         self.assertEqual(options.abc, 12)
         self.assertEqual(options.cde, "ddd")
         self.assertEqual(options.fgh, 23.4)
+        self.assertIs(
+            type(options), type(BasicOptions(names=["abc", "cde", "fgh"])))
+        self.assertIsInstance(options, BasicOptions)
+        self.assertDictEqual(options.values(), {
+            "abc": 12,
+            "cde": "ddd",
+            "fgh": 23.4
+        })
 
     def test_setattr(self):
         options = BasicOptions(names=["abc", "cde", "efg"])
@@ -54,6 +65,9 @@ class TestArgumentOptions(unittest.TestCase):
         self.assertTrue(hasattr(options, "type"))
         self.assertTrue(hasattr(options, "metavar"))
         self.assertTrue(hasattr(options, "dest"))
+        self.assertFalse(hasattr(options, "__dict__"))
+        self.assertListEqual(
+            list(options.values()), list(ArgumentOptions.NAMES))
 
 
 class TestOptions(unittest.TestCase):
@@ -66,6 +80,10 @@ class TestOptions(unittest.TestCase):
         self.assertTrue(hasattr(options, "max"))
         self.assertTrue(hasattr(options, "argoptions"))
         self.assertRaises(TypeError, Options, None)
+        self.assertFalse(hasattr(options, "__dict__"))
+        self.assertListEqual(list(options.values()), [
+            "type", "value", "required", "min", "max", "help", "argoptions"
+        ])
 
     def test_setattr(self):
         options = Options()
@@ -115,10 +133,78 @@ class TestOptions(unittest.TestCase):
         options.value = 12.4
         self.assertEqual(options.value, None)
 
+        options = Options(type="no.such.Type")
+        self.assertEqual(options.type, "no.such.Type")
+        self.assertRaises(NameError, setattr, options, "value", 12)
+        options.type = "int"
+        options.value = "12"
+        self.assertEqual(options.value, 12)
+        self.assertNotIn("_converter", options.values())
+
         argoptionsoptions = ArgumentOptions(required=True)
         options.argoptions = argoptionsoptions
         self.assertIs(options.argoptions, argoptionsoptions)
 
+    def test_watch(self):
+        records = []
+
+        def watcher(options, name, old):
+            records.append((name, old, getattr(options, name)))
+
+        options = Options(type=float, value=1.5)
+        options.watch(watcher)
+        options.watch(watcher)
+        options.value = "2.5"
+        options.type = int
+        options.help = "value"
+        self.assertListEqual(records, [("value", 1.5, 2.5),
+                                       ("value", 2.5, 2),
+                                       ("type", "float", "int"),
+                                       ("help", None, "value")])
+        options.unwatch(watcher)
+        options.value = 3
+        self.assertEqual(len(records), 4)
+        self.assertIsNone(options._watchers)
+
+    def test_deepcopy(self):
+        options = Options(
+            type="int", value="3", argoptions={"short": "x"})
+        options.watch(lambda options, name, old: None)
+        copied = copy.deepcopy(options)
+        self.assertIsNot(copied, options)
+        self.assertDictEqual(copied.values()["argoptions"].values(),
+                             options.argoptions.values())
+        self.assertIsNot(copied.argoptions, options.argoptions)
+        self.assertIsNone(copied._watchers)
+        copied.value = "5"
+        self.assertEqual(copied.value, 5)
+        self.assertEqual(options.value, 3)
+
+        frozen = copy.deepcopy(Options(value=[1]).freeze())
+        self.assertListEqual(frozen.value, [1])
+        self.assertRaises(errors.ConfigError, setattr, frozen, "value", 2)
+        basic = copy.deepcopy(BasicOptions(names=["abc"], abc=1))
+        self.assertIs(type(basic), type(BasicOptions(names=["abc"])))
+        self.assertEqual(basic.abc, 1)
+
+    def test_pickle(self):
+        options = Options(
+            type="int", value="3", argoptions={"short": "x"})
+        restored = pickle.loads(pickle.dumps(options))
+        self.assertEqual(repr(restored), repr(options))
+        restored.value = "5"
+        self.assertEqual(restored.value, 5)
+
+        frozen = pickle.loads(pickle.dumps(Options(value=1).freeze()))
+        self.assertIs(type(frozen), type(Options().freeze()))
+        self.assertRaises(errors.ConfigError, setattr,
+                          frozen, "value", 2)
+        basic = BasicOptions(names=["abc"], abc=1)
+        for item in (basic, BasicOptions(names=["abc"], abc=1).freeze()):
+            restored = pickle.loads(pickle.dumps(item))
+            self.assertIs(type(restored), type(item))
+            self.assertEqual(restored.abc, 1)
+
     def test_update_values(self):
         options = Options()
         options.update_values({
@@ -254,3 +340,45 @@ class TestOptions(unittest.TestCase):
         self.assertRaises(AssertionError, options.assert_value, {
             "required": True
         })
+
+    def test_argument_options_cache(self):
+        options = Options(type=int, value=1, help="number")
+        first = options.argument_options()
+        cache = options._argcache
+        first["dest"] = "changed"
+        self.assertDictEqual(options.argument_options(), {
+            "type": int,
+            "default": 1,
+            "help": "number"
+        })
+        self.assertIs(options._argcache, cache)
+
+        options.value = 2
+        self.assertEqual(options.argument_options()["default"], 2)
+        options.value = None
+        self.assertNotIn("default", options.argument_options())
+        self.assertIs(options._argcache, cache)
+
+        options.help = "count"
+        self.assertEqual(options.argument_options()["help"], "count")
+        options.argoptions = {"metavar": "N"}
+        self.assertEqual(options.argument_options()["metavar"], "N")
+        cache = options._argcache
+        options.argoptions.metavar = "COUNT"
+        self.assertEqual(options.argument_options()["metavar"], "COUNT")
+        self.assertIsNot(options._argcache, cache)
+        options.type = float
+        self.assertIs(options.argument_options()["type"], float)
+
+    def test_violations(self):
+        options = Options(type=int, value=3, min=6, max=1, required=True)
+        self.assertListEqual([kind for kind, _ in options.violations()],
+                             ["min", "max"])
+        options.value = None
+        self.assertListEqual([kind for kind, _ in options.violations()],
+                             ["required", "type"])
+        self.assertListEqual(options.violations({"max": 1}), [])
+        options = Options(value="x")
+        self.assertListEqual(options.violations({"min": 1}), [
+            ("min", "'Options' object: attribute 'value': 'x' required >= 1")
+        ])
@@ -0,0 +1,169 @@
+import unittest
+from pyconfigmanager.reload import ConfigReloader, PollWatcher
+from pyconfigmanager.reload import InotifyWatcher
+from pyconfigmanager import watchconfig
+import os
+import tempfile
+import threading
+
+
+class ScriptedWatcher():
+    def __init__(self, script):
+        self.script = list(script)
+        self.closed = threading.Event()
+
+    def wait(self, timeout):
+        if self.script:
+            return set(self.script.pop(0))
+        self.closed.wait(timeout)
+        return set()
+
+    def close(self):
+        self.closed.set()
+
+
+class TestConfigReloader(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.schemafile = self.write("schema.yaml",
+                                     "test:\n  a: 1\n  b:\n    c: x\n")
+        self.valuesfile = self.write("values.json",
+                                     '{"test": {"a": 2, "b": {"c": "y"}}}')
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def write(self, name, content):
+        filename = os.path.join(self.tempdir.name, name)
+        with open(filename, "wt") as stream:
+            stream.write(content)
+        return filename
+
+    def test_reload(self):
+        reloader = ConfigReloader(
+            schema=self.schemafile,
+            values=[self.valuesfile, {
+                "test": {
+                    "b": {
+                        "c": "z"
+                    }
+                }
+            }],
+            pickname="test")
+        config = reloader.config
+        self.assertEqual(config.a, 2)
+        self.assertEqual(config.b.c, "z")
+        events = []
+        reloader.subscribe(
+            lambda config, changes: events.append((config, changes)))
+
+        self.write("values.json", '{"test": {"a": "3"}}')
+        self.assertDictEqual(
+            reloader.reload([self.valuesfile]), {"a": (2, 3)})
+        self.assertIsNot(reloader.config, config)
+        self.assertEqual(config.a, 2)
+        config = reloader.config
+        self.assertEqual(config.a, 3)
+        self.assertIs(events[-1][0], config)
+        self.assertDictEqual(reloader.reload([self.valuesfile]), {})
+        self.assertEqual(len(events), 1)
+
+        self.write("values.json", '{"test": {}}')
+        self.assertDictEqual(reloader.reload(), {"a": (3, 1)})
+
+        self.write("schema.yaml", "test:\n  a: 1\n  b: {c: x}\n  d: 4\n")
+        self.assertDictEqual(
+            reloader.reload([self.schemafile]), {"d": (None, 4)})
+        self.assertNotIn("d", config)
+        config = reloader.config
+        self.assertEqual(config.d, 4)
+        self.assertEqual(config.b.c, "z")
+
+        self.write("schema.yaml", "test:\n  a: 1\n")
+        with self.assertLogs(level="WARNING"):
+            self.assertDictEqual(reloader.reload([self.schemafile]), {})
+        self.assertIs(reloader.config, config)
+        self.assertEqual(config.d, 4)
+        self.write("schema.yaml", "test:\n  a: 1\n  b: {c: x}\n  d: 4\n")
+
+        self.write("values.json", '{"test": ')
+        with self.assertLogs(level="WARNING"):
+            self.assertDictEqual(reloader.reload([self.valuesfile]), {})
+        self.assertIs(reloader.config, config)
+        self.assertEqual(config.a, 1)
+        self.assertEqual(len(events), 3)
+
+    def test_revalidate(self):
+        self.write("schema.yaml",
+                   "test:\n  a: {.value: 1, .max: 5}\n  b: {c: x}\n")
+        reloader = ConfigReloader(
+            schema=self.schemafile, values=self.valuesfile, pickname="test")
+        self.assertTrue(reloader.config.revalidate().isvalid())
+        self.write("values.json", '{"test": {"a": 7, "b": {"c": "y"}}}')
+        self.assertDictEqual(reloader.reload(), {"a": (2, 7)})
+        plan = reloader.config.validation_plan()
+        self.assertSetEqual(plan.dirty, {"a"})
+        self.assertListEqual(reloader.config.revalidate().paths(), ["a"])
+
+    def test_debounce(self):
+        watcher = ScriptedWatcher([[self.valuesfile], [self.valuesfile],
+                                   [self.schemafile]])
+        reloaded = []
+        reloader = ConfigReloader(
+            schema=self.schemafile,
+            values=self.valuesfile,
+            pickname="test",
+            interval=0.01,
+            debounce=0.01,
+            watcher=watcher)
+        done = threading.Event()
+
+        def reload(filenames=None):
+            reloaded.append(sorted(filenames))
+            done.set()
+
+        reloader.reload = reload
+        reloader.start()
+        self.assertTrue(done.wait(5))
+        reloader.stop(5)
+        self.assertTrue(watcher.closed.is_set())
+        self.assertListEqual(reloaded,
+                             [sorted([self.schemafile, self.valuesfile])])
+
+    def test_poll_watcher(self):
+        watcher = PollWatcher([self.valuesfile, self.schemafile])
+        self.assertSetEqual(watcher.check(), set())
+        self.write("values.json", '{"test": {"a": 12345}}')
+        self.assertSetEqual(watcher.wait(0), {self.valuesfile})
+        os.remove(self.schemafile)
+        self.assertSetEqual(watcher.check(), {self.schemafile})
+
+    def test_inotify_watcher(self):
+        try:
+            watcher = InotifyWatcher([self.valuesfile])
+        except (OSError, AttributeError):
+            self.skipTest("inotify is not available")
+        try:
+            self.assertSetEqual(watcher.wait(0), set())
+            self.write("values.json", '{"test": {"a": 5}}')
+            self.write("other.json", '{}')
+            self.assertSetEqual(watcher.wait(5), {self.valuesfile})
+        finally:
+            watcher.close()
+
+    def test_watchconfig(self):
+        changed = threading.Event()
+        reloader = watchconfig(
+            schema=self.schemafile,
+            values=self.valuesfile,
+            pickname="test",
+            callback=lambda config, changes: changed.set(),
+            interval=0.02,
+            debounce=0.02,
+            watcher="poll")
+        try:
+            self.write("values.json", '{"test": {"a": 7}}')
+            self.assertTrue(changed.wait(5))
+            self.assertEqual(reloader.config.a, 7)
+        finally:
+            reloader.stop(5)
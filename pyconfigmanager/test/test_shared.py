@@ -0,0 +1,68 @@
+import unittest
+from pyconfigmanager.shared import SharedConfig
+from pyconfigmanager.config import Config
+from pyconfigmanager import errors
+import threading
+
+
+class TestSharedConfig(unittest.TestCase):
+    def test_update(self):
+        config = Config({"a": 1, "b": {"c": "x"}})
+        shared = SharedConfig(config)
+        snapshot = shared.config
+        self.assertRaises(errors.ConfigError, setattr, snapshot, "a", 2)
+        config.a = 3
+        self.assertEqual(snapshot.a, 1)
+
+        shared.update_values({"a": 2, "b": {"c": "y"}})
+        self.assertEqual(snapshot.a, 1)
+        self.assertEqual(snapshot.b.c, "x")
+        self.assertEqual(shared.config.a, 2)
+        self.assertEqual(shared.config.b.c, "y")
+
+        changes = shared.update_schema({"d": 1.5})
+        self.assertListEqual(changes, ["d"])
+        self.assertNotIn("d", snapshot)
+        self.assertEqual(shared.config.d, 1.5)
+
+        self.assertEqual(shared.update(lambda config: config.schema("a")),
+                         shared.config.schema("a"))
+        self.assertEqual(SharedConfig().config.values(), {})
+
+    def test_failed_update(self):
+        shared = SharedConfig(Config({"a": 1}))
+        snapshot = shared.config
+        self.assertRaises(AttributeError, shared.update_values, {"b": 1})
+        self.assertIs(shared.config, snapshot)
+
+    def test_publish(self):
+        shared = SharedConfig(Config({"a": 1}))
+        config = Config({"a": 2, "b": 3})
+        snapshot = shared.publish(config)
+        self.assertIs(shared.config, snapshot)
+        self.assertEqual(snapshot.values(), {"a": 2, "b": 3})
+        config.a = 4
+        self.assertEqual(shared.config.a, 2)
+
+    def test_concurrent_readers(self):
+        shared = SharedConfig(Config({"a": 0, "b": 0}))
+        stop = threading.Event()
+        errors_seen = []
+
+        def read():
+            while not stop.is_set():
+                snapshot = shared.config
+                values = snapshot.values()
+                if values["a"] != values["b"]:
+                    errors_seen.append(values)
+
+        readers = [threading.Thread(target=read) for _ in range(4)]
+        for reader in readers:
+            reader.start()
+        for index in range(1, 200):
+            shared.update_values({"a": index, "b": index})
+        stop.set()
+        for reader in readers:
+            reader.join()
+        self.assertListEqual(errors_seen, [])
+        self.assertEqual(shared.config.a, 199)
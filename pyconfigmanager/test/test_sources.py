@@ -0,0 +1,110 @@
+import unittest
+from pyconfigmanager.sources import Pipeline, Source, FileSource
+from pyconfigmanager.sources import DictSource, EnvironSource, ArgvSource
+from pyconfigmanager.sources import RemoteSource
+from pyconfigmanager import errors
+import os
+import tempfile
+
+
+class CountingSource(DictSource):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.loads = 0
+        self.applies = 0
+
+    def load(self):
+        self.loads += 1
+        return super().load()
+
+    def apply(self, config, data):
+        self.applies += 1
+        return super().apply(config, data)
+
+
+class TestPipeline(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def write(self, name, contents):
+        filename = os.path.join(self.tempdir.name, name)
+        with open(filename, "w") as stream:
+            stream.write(contents)
+        return filename
+
+    def test_layers(self):
+        schemafile = self.write("schema.yaml",
+                                "a: 1\nb: 2\nc: x\nd: [1]\nflag: false\n")
+        valuesfile = self.write("values.json", '{"a": 10, "b": 20}')
+        values = CountingSource({"b": 30}, pickname="")
+        top = CountingSource({"c": "y"})
+        pipeline = Pipeline([
+            FileSource(schemafile, kind="schema", excludes=[]),
+            FileSource(valuesfile),
+            values,
+            EnvironSource("APP", environ={"APP_D": "[2, 3]", "B": "0"}),
+            ArgvSource(["--flag", "true"]),
+            top,
+        ])
+        config = pipeline.refresh()
+        self.assertEqual(config.values(), {
+            "a": 10,
+            "b": 30,
+            "c": "y",
+            "d": [2, 3],
+            "flag": True,
+        })
+        self.assertRaises(errors.ConfigError, setattr, config, "a", 0)
+        self.assertIs(pipeline.refresh(), config)
+        self.assertEqual((values.loads, values.applies), (1, 1))
+        self.assertEqual(pipeline.sources[4].args.flag, True)
+        self.assertRaises(ValueError, EnvironSource, "")
+        self.assertIsNone(pipeline.layers[0][3])
+        self.assertEqual(pipeline.layers[-1][3], {"c": "x"})
+
+        top.update({"c": "z"})
+        config = pipeline.refresh()
+        self.assertEqual(config.c, "z")
+        self.assertEqual((values.loads, values.applies), (1, 1))
+        self.assertEqual((top.loads, top.applies), (2, 2))
+
+        values.update({"b": 40})
+        config = pipeline.refresh()
+        self.assertEqual(config.b, 40)
+        self.assertEqual(config.c, "z")
+        self.assertEqual((values.loads, values.applies), (2, 2))
+        self.assertEqual((top.loads, top.applies), (2, 3))
+
+        self.write("values.json", '{"a": 11, "b": 21, "c": "w"}')
+        os.utime(valuesfile, ns=(1, 1))
+        config = pipeline.refresh()
+        self.assertEqual((config.a, config.b, config.c), (11, 40, "z"))
+        self.assertEqual((values.loads, values.applies), (2, 3))
+
+        pipeline.sources.pop()
+        self.assertEqual(pipeline.refresh().c, "w")
+        pipeline.add(DictSource({"e": 5}, kind="schema"))
+        self.assertEqual(pipeline.refresh().e, 5)
+
+    def test_remote(self):
+        fetched = []
+
+        def fetch():
+            fetched.append(1)
+            return [{"a": len(fetched)}]
+
+        remote = RemoteSource(fetch)
+        pipeline = Pipeline([DictSource({"a": 0}, kind="schema"), remote])
+        self.assertEqual(pipeline.refresh().a, 1)
+        self.assertEqual(pipeline.refresh().a, 1)
+        remote.invalidate()
+        self.assertEqual(pipeline.refresh().a, 2)
+        self.assertNotEqual(
+            RemoteSource(fetch, ttl=60).key(), RemoteSource(fetch).key())
+
+    def test_empty(self):
+        self.assertEqual(Pipeline().refresh().values(), {})
+        self.assertRaises(ValueError, Source, kind="other")
@@ -1,9 +1,16 @@
 import unittest
 from pyconfigmanager.utils import typename, locate_type, convert_type
+from pyconfigmanager.utils import register_type, unregister_type
+from pyconfigmanager.utils import clear_type_cache, compile_converter
+from pyconfigmanager import utils
 from pyconfigmanager.utils import pickitems
 from pyconfigmanager.utils import load_yaml, load_json, dump_json, dump_yaml
 from pyconfigmanager.utils import detect_filetype
 from pyconfigmanager.utils import load_config
+from pyconfigmanager.utils import pick_yaml, iter_json
+import io
+import json
+import yaml
 import tempfile
 import os
 
@@ -32,12 +39,100 @@ class TestUtils(unittest.TestCase):
         self.assertEqual(locate_type(str), str)
         self.assertEqual(locate_type(int), int)
 
+    def test_type_cache(self):
+        clear_type_cache()
+        self.assertEqual(locate_type("unittest.case.TestCase"),
+                         unittest.TestCase)
+        self.assertIn("unittest.case.TestCase", utils._type_cache)
+        clear_type_cache("unittest.case.TestCase")
+        self.assertNotIn("unittest.case.TestCase", utils._type_cache)
+        self.assertRaises(NameError, locate_type, "no.such.Type")
+        self.assertNotIn("no.such.Type", utils._type_cache)
+
+        size = utils.TYPE_CACHE_SIZE
+        utils.TYPE_CACHE_SIZE = 2
+        try:
+            for name in ("int", "str", "float"):
+                locate_type(name)
+            self.assertListEqual(list(utils._type_cache), ["str", "float"])
+            locate_type("str")
+            locate_type("list")
+            self.assertListEqual(list(utils._type_cache), ["str", "list"])
+        finally:
+            utils.TYPE_CACHE_SIZE = size
+            clear_type_cache()
+
+    def test_converter_cache(self):
+        clear_type_cache()
+        converter = compile_converter("int")
+        self.assertIn(int, utils._converter_cache)
+        clear_type_cache()
+        self.assertNotIn(int, utils._converter_cache)
+        self.assertIsNot(compile_converter("int"), converter)
+
+        size = utils.CONVERTER_CACHE_SIZE
+        utils.CONVERTER_CACHE_SIZE = 2
+        try:
+            for name in ("int", "str", "float"):
+                compile_converter(name)
+            compile_converter("str")
+            compile_converter("list")
+            self.assertListEqual(list(utils._converter_cache), [str, list])
+        finally:
+            utils.CONVERTER_CACHE_SIZE = size
+            clear_type_cache()
+
+        class Duration(int):
+            pass
+
+        register_type("mypkg.Duration", Duration)
+        compile_converter("mypkg.Duration")
+        self.assertIn(Duration, utils._converter_cache)
+        unregister_type("mypkg.Duration")
+        self.assertNotIn(Duration, utils._converter_cache)
+
+    def test_register_type(self):
+        class Duration(int):
+            pass
+
+        register_type("mypkg.Duration", Duration)
+        self.assertIs(locate_type("mypkg.Duration"), Duration)
+        self.assertEqual(convert_type("12", "mypkg.Duration"), 12)
+        self.assertIsInstance(
+            convert_type("12", "mypkg.Duration"), Duration)
+        self.assertIs(unregister_type("mypkg.Duration"), Duration)
+        self.assertRaises(NameError, locate_type, "mypkg.Duration")
+
+        register_type(Duration)
+        self.assertIs(locate_type(typename(Duration)), Duration)
+        unregister_type(Duration)
+        self.assertRaises(TypeError, register_type, "mypkg.Duration", 12)
+
     def test_convert_type(self):
         self.assertEqual(convert_type("12", "int"), 12)
         self.assertEqual(convert_type("12", int), 12)
         self.assertEqual(convert_type("hello", int), None)
         self.assertEqual(convert_type(12.34, list), None)
 
+    def test_compile_converter(self):
+        converter = compile_converter("int")
+        self.assertIs(converter, compile_converter(int))
+        self.assertEqual(converter("12"), 12)
+        self.assertEqual(converter(12.7), 12)
+        self.assertIs(converter(True), True)
+        self.assertEqual(converter("hello"), None)
+        self.assertEqual(compile_converter(float)("1.5"), 1.5)
+        self.assertEqual(compile_converter(str)([1, 2]), "[1, 2]")
+        self.assertEqual(compile_converter(list)("12"), ["1", "2"])
+        self.assertEqual(compile_converter(list)(12.34), None)
+        self.assertEqual(compile_converter(dict)([("a", 1)]), {"a": 1})
+        self.assertIs(compile_converter(bool)(""), False)
+        self.assertIs(compile_converter(bool)("no"), True)
+        self.assertEqual(
+            compile_converter("unittest.case.TestCase")(None), None)
+        self.assertRaises(NameError, compile_converter, "no.such.Type")
+        self.assertRaises(TypeError, compile_converter, None)
+
     def test_pickitems(self):
         item = {"a": {"b": 1, "c": 3}, "d": 56}
         compare_item = pickitems(item, pickname="", excludes=["b", "c"])
@@ -276,3 +371,122 @@ w: 12
                 "e": 12
             }
         }])
+
+    def test_pick_yaml(self):
+        content = """
+---
+base: &base
+  pool:
+    size: 4
+tenants:
+  other:
+    a: [1, 2, 3]
+    b: &shared
+      c: 12
+  acme:
+    <<: *base
+    name: acme
+    shared: *shared
+    1: one
+---
+tenants:
+  acme: 12
+---
+---
+other: 1
+"""
+        result = list(pick_yaml(content, "tenants.acme"))
+        self.assertListEqual(result, [{
+            "pool": {
+                "size": 4
+            },
+            "name": "acme",
+            "shared": {
+                "c": 12
+            },
+            1: "one"
+        }, {}, {}])
+        self.assertListEqual(
+            list(pick_yaml(content, "tenants.acme.pool")), [{
+                "size": 4
+            }, {}, {}])
+        self.assertListEqual(
+            list(pick_yaml(content, ["tenants", "other", "b"])), [{
+                "c": 12
+            }, {}, {}])
+        self.assertListEqual(list(pick_yaml("a: 1\na: {b: 2}", "a")),
+                             [{"b": 2}])
+        for pickname in ("tenants.acme", "tenants.other", "base"):
+            self.assertListEqual(
+                list(load_yaml(contents=content, pickname=pickname)), [
+                    pickitems(item, pickname=pickname, excludes=[])
+                    for item in load_yaml(contents=content)
+                ])
+
+    def test_use_libyaml(self):
+        loader = utils.YAML_LOADER
+        try:
+            self.assertFalse(utils.use_libyaml(False))
+            self.assertIs(utils.YAML_LOADER, yaml.SafeLoader)
+            self.assertIs(utils.YAML_DUMPER, yaml.SafeDumper)
+            filename = os.path.join(self.filesdir, "schema.yaml")
+            python_result = list(load_config(filename, pickname="test"))
+            if utils.CSafeLoader is None:
+                self.assertRaises(ImportError, utils.use_libyaml, True)
+                return
+            self.assertTrue(utils.use_libyaml(True))
+            self.assertIs(utils.YAML_LOADER, utils.CSafeLoader)
+            self.assertListEqual(
+                list(load_config(filename, pickname="test")), python_result)
+        finally:
+            utils.use_libyaml(loader is utils.CSafeLoader)
+
+    def test_iter_json(self):
+        content = '[{"a": {"b": [1, 2]}}, {"c": "d e"}, 12, "x"]'
+        for chunk_size in (1, 3, 1024):
+            self.assertListEqual(
+                list(iter_json(io.StringIO(content), chunk_size)),
+                [{"a": {"b": [1, 2]}}, {"c": "d e"}, 12, "x"])
+        content = '{"a": 1}\n{"a": 22}\n  \n{"b": [3]}\n'
+        self.assertListEqual(
+            list(iter_json(io.StringIO(content), 2)),
+            [{"a": 1}, {"a": 22}, {"b": [3]}])
+        self.assertListEqual(list(iter_json(io.StringIO("1234"), 2)), [1234])
+        self.assertRaises(ValueError, list, iter_json(io.StringIO('{"a": ')))
+        self.assertRaises(ValueError, list, iter_json(io.StringIO('[1, 2')))
+
+    def test_load_json_single_object(self):
+        values = {
+            "tenants": {
+                "t{}".format(index): {
+                    "name": "tenant {}".format(index),
+                    "limits": list(range(index % 7))
+                }
+                for index in range(2000)
+            }
+        }
+        content = json.dumps(values, indent=2)
+        self.assertListEqual(
+            list(iter_json(io.StringIO(content), 16)), [values])
+        self.assertListEqual(
+            list(iter_json(io.StringIO(content + "\n" + content), 16)),
+            [values, values])
+        with tempfile.NamedTemporaryFile(
+                mode="wt", suffix=".json", delete=False) as stream:
+            stream.write(content)
+        try:
+            self.assertListEqual(
+                list(load_json(filenames=stream.name,
+                               pickname="tenants.t5")),
+                [values["tenants"]["t5"]])
+        finally:
+            os.remove(stream.name)
+
+    def test_load_config_pickname(self):
+        jsonfile = os.path.join(self.filesdir, "values.json")
+        yamlfile = os.path.join(self.filesdir, "2.yaml")
+        self.assertListEqual(
+            list(load_config([yamlfile, jsonfile], pickname="test.c")),
+            [{"d": "hello"}, {"d": 76, "e": "he"}])
+        self.assertListEqual(
+            list(load_config(jsonfile, pickname="test.a")), [{}])
@@ -0,0 +1,197 @@
+import unittest
+from pyconfigmanager.config import Config
+from pyconfigmanager.options import Options
+from pyconfigmanager.validation import ValidationReport, Violation
+from pyconfigmanager.validation import ValidationPlan
+import gc
+import weakref
+
+
+class TestValidation(unittest.TestCase):
+    def build(self):
+        return Config({
+            "a": 12,
+            "b": {
+                ".type": int,
+                ".value": 123,
+                ".max": 12,
+                ".min": 0
+            },
+            "c": {
+                "d": {
+                    ".type": "str",
+                    ".required": True
+                },
+                "e": {
+                    ".type": float,
+                    ".value": 1.5,
+                    ".min": 2
+                },
+                "f": {
+                    ".value": None
+                },
+            },
+        })
+
+    def test_validate(self):
+        config = self.build()
+        report = config.validate()
+        self.assertIsInstance(report, ValidationReport)
+        self.assertFalse(report.isvalid())
+        self.assertListEqual([(item.path, item.kind) for item in report],
+                             [("b", "max"), ("c.d", "required"),
+                              ("c.d", "type"), ("c.e", "min")])
+        self.assertListEqual(report.paths(), ["b", "c.d", "c.e"])
+        self.assertEqual(len(report), 4)
+        self.assertEqual(report.values()[0]["path"], "b")
+        self.assertEqual(report.messages()[0],
+                         "b: 'Options' object: attribute 'value': "
+                         "'123' required <= 12")
+        with self.assertRaises(AssertionError) as context:
+            config.assert_values()
+        self.assertEqual(str(context.exception), "\n".join(report.messages()))
+
+        config.b = 6
+        config.c.d = "x"
+        config.c.e = 3
+        self.assertTrue(config.validate().isvalid())
+        config.assert_values()
+
+    def test_plan_cache(self):
+        config = self.build()
+        plan = config.validation_plan()
+        self.assertIs(config.validation_plan(), plan)
+        config.b = 6
+        self.assertIs(config.validation_plan(), plan)
+        Options(type="int", value=1, max=0, required=True)
+        config.getattr("a", raw=True).violations(options={"max": 0})
+        Config({"x": {".type": "int", ".min": 1}})
+        self.assertIs(config.validation_plan(), plan)
+        config.getattr("a", raw=True).help = "a"
+        self.assertIs(config.validation_plan(), plan)
+
+        config.getattr("c", raw=True).getattr("e", raw=True).min = 1
+        self.assertIsNot(config.validation_plan(), plan)
+        self.assertNotIn("c.e", config.validate().paths())
+
+        plan = config.validation_plan()
+        config.update_schema({"g": {".type": "int"}})
+        self.assertIsNot(config.validation_plan(), plan)
+        self.assertIn("g", config.validate().paths())
+
+        config.update_schema({"g": {".type": "str"}})
+        self.assertEqual(
+            [item.message for item in config.validate() if item.path == "g"],
+            ["'Options' object: attribute 'value': 'None' is not type 'str'"])
+
+    def test_unknown_type(self):
+        config = Config({"a": {".type": "no.such.Type"}})
+        self.assertListEqual(
+            list(config.validate()),
+            [Violation("a", "type", "type 'no.such.Type' not found")])
+
+    def test_schema(self):
+        config = self.build()
+        report = config.validate(schema={"a": True, "c": {"e": True}})
+        self.assertListEqual([(item.path, item.kind) for item in report],
+                             [("c.e", "min")])
+        report = config.validate(schema={"x": True, "a": {".max": 10}})
+        self.assertListEqual([(item.path, item.kind) for item in report],
+                             [("x", "missing"), ("a", "max")])
+        report = config.validate(schema={"c": {".type": int}})
+        self.assertListEqual([(item.path, item.kind) for item in report],
+                             [("c", "schema")])
+
+    def test_frozen(self):
+        config = self.build().freeze()
+        plan = config.validation_plan()
+        Config({"a": 1}).update_schema({"a": {".max": 0}})
+        self.assertIs(config.validation_plan(), plan)
+        self.assertEqual(len(config.validate()), 4)
+
+    def test_revalidate(self):
+        config = self.build()
+        report = config.revalidate()
+        self.assertListEqual(report.paths(), ["b", "c.d", "c.e"])
+        plan = config.validation_plan()
+        self.assertSetEqual(plan.dirty, set())
+
+        config.update_values({"a": 1, "b": 6})
+        self.assertSetEqual(plan.dirty, {"a", "b"})
+        checked = []
+        check = plan.check
+        plan.check = lambda path: checked.append(path) or check(path)
+        report = config.revalidate()
+        self.assertListEqual(sorted(checked), ["a", "b"])
+        self.assertListEqual(report.paths(), ["c.d", "c.e"])
+        self.assertSetEqual(plan.dirty, set())
+
+        config.c.d = "x"
+        config.b = 13
+        self.assertListEqual(config.revalidate().paths(), ["b", "c.e"])
+        self.assertListEqual(config.revalidate().messages(),
+                             config.validate().messages())
+        with self.assertRaises(AssertionError):
+            config.assert_values(incremental=True)
+        config.b = 0
+        config.c.e = 2.5
+        config.assert_values(incremental=True)
+
+    def test_revalidate_unrelated_config(self):
+        config = self.build()
+        config.revalidate()
+        plan = config.validation_plan()
+        checked = []
+        check = plan.check
+        plan.check = lambda path: checked.append(path) or check(path)
+        for value in (6, 13):
+            Config({"x": value, "y": {"z": {".type": "int", ".max": 1}}})
+            other = Config({"b": 1})
+            del other["b"]
+            config.b = value
+            report = config.revalidate()
+            self.assertIs(config.validation_plan(), plan)
+        self.assertListEqual(checked, ["b", "b"])
+        self.assertListEqual(report.paths(), ["b", "c.d", "c.e"])
+        self.assertListEqual(report.messages(), config.validate().messages())
+
+    def test_revalidate_schema_change(self):
+        config = self.build()
+        config.revalidate()
+        plan = config.validation_plan()
+        config.b = 20
+        config.update_schema({"b": {".max": 30}, "g": {".type": "int"}})
+        fresh = config.validation_plan()
+        self.assertIsNot(fresh, plan)
+        self.assertIsNone(plan.paths)
+        self.assertSetEqual(fresh.dirty, {"b", "g"})
+        report = config.revalidate()
+        self.assertListEqual(report.paths(), ["g", "c.d", "c.e"])
+        self.assertListEqual(report.messages(), config.validate().messages())
+        self.assertEqual(
+            list(config.getattr("a", raw=True)._watchers), [fresh.watcher])
+
+    def test_plan_released(self):
+        config = self.build()
+        plan = ValidationPlan(config)
+        plan.run()
+        reference = weakref.ref(plan)
+        del plan
+        gc.collect()
+        self.assertIsNone(reference())
+        self.assertIsNone(config.getattr("a", raw=True)._watchers)
+
+        plan = config.validation_plan()
+        config.revalidate()
+        reference = weakref.ref(plan)
+        config.update_schema({"b": {".max": 30}})
+        config.b = 20
+        del plan
+        self.assertIsNot(config.validation_plan(), reference())
+        gc.collect()
+        self.assertIsNone(reference())
+        plan = config.validation_plan()
+        self.assertEqual(
+            list(config.getattr("b", raw=True)._watchers), [plan.watcher])
+        plan.close()
+        self.assertIsNone(config.getattr("b", raw=True)._watchers)
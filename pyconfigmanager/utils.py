@@ -1,18 +1,52 @@
 from pydoc import locate
+from collections import OrderedDict
+import threading
 import logging
 import yaml
 import os
 import json as JSON
 
 
-def pickitems(data, pickname="", excludes=["schema"]):
+try:
+    from yaml import CSafeLoader, CSafeDumper
+except ImportError:
+    CSafeLoader = None
+    CSafeDumper = None
+
+YAML_LOADER = yaml.SafeLoader
+YAML_DUMPER = yaml.SafeDumper
+
+
+def use_libyaml(enable=None):
+    global YAML_LOADER, YAML_DUMPER
+    if enable is None:
+        enable = os.environ.get("PYCONFIGMANAGER_LIBYAML", "1")
+        enable = enable.lower() not in ("0", "false", "no", "off")
+        enable = enable and CSafeLoader is not None
+    if enable:
+        if CSafeLoader is None:
+            raise ImportError("PyYAML is not built with libyaml")
+        YAML_LOADER, YAML_DUMPER = CSafeLoader, CSafeDumper
+    else:
+        YAML_LOADER, YAML_DUMPER = yaml.SafeLoader, yaml.SafeDumper
+    return enable
+
+
+use_libyaml()
+
+
+def picknames(pickname):
     if isinstance(pickname, str):
-        names = [item for item in pickname.split(".") if item]
+        names = pickname.split(".")
     elif isinstance(pickname, list):
         names = pickname
     else:
         names = []
-    names = [item for item in names if item]
+    return [item for item in names if item]
+
+
+def pickitems(data, pickname="", excludes=["schema"]):
+    names = picknames(pickname)
     result = dict(data.items())
     for name in names:
         if name in result:
@@ -33,6 +67,49 @@ def typename(type_instance):
     return "{}.{}".format(type_instance.__module__, type_instance.__name__)
 
 
+TYPE_CACHE_SIZE = 1024
+CONVERTER_CACHE_SIZE = 256
+TYPE_ALIASES = {"module": "types.ModuleType"}
+
+_type_registry = {}
+_type_cache = OrderedDict()
+_type_cache_lock = threading.Lock()
+
+
+def register_type(name, real_type=None):
+    if real_type is None:
+        real_type = name
+        name = typename(real_type)
+    if not isinstance(real_type, type):
+        raise TypeError("'{}' is not an instance of 'type'".format(real_type))
+    with _type_cache_lock:
+        _type_registry[name] = real_type
+        _type_cache.pop(name, None)
+    return real_type
+
+
+def unregister_type(name):
+    if isinstance(name, type):
+        name = typename(name)
+    with _type_cache_lock:
+        _type_cache.pop(name, None)
+        real_type = _type_registry.pop(name, None)
+        _converter_cache.pop(real_type, None)
+        return real_type
+
+
+def clear_type_cache(name=None):
+    with _type_cache_lock:
+        if name is None:
+            _type_cache.clear()
+            _converter_cache.clear()
+            return
+        real_type = _type_cache.pop(name, None)
+        if real_type is None:
+            real_type = _type_registry.get(name)
+        _converter_cache.pop(real_type, None)
+
+
 def locate_type(name):
     if not name:
         return None
@@ -43,33 +120,93 @@ def locate_type(name):
     if not isinstance(name, str):
         return None
 
-    if name == "module":
-        name = "types.ModuleType"
-    real_type = locate(name)
+    real_type = _type_registry.get(name)
+    if real_type is not None:
+        return real_type
+    with _type_cache_lock:
+        real_type = _type_cache.get(name)
+        if real_type is not None:
+            _type_cache.move_to_end(name)
+            return real_type
+
+    real_type = locate(TYPE_ALIASES.get(name, name))
     if real_type is None:
         raise NameError("type '{}' can not be located".format(name))
+    with _type_cache_lock:
+        _type_cache[name] = real_type
+        while len(_type_cache) > TYPE_CACHE_SIZE:
+            _type_cache.popitem(last=False)
     return real_type
 
 
-def convert_type(value, value_type):
+_converter_cache = OrderedDict()
+
+
+def compile_converter(value_type):
     if not isinstance(value_type, type):
+        name = value_type
         value_type = locate_type(value_type)
-    if isinstance(value, value_type):
-        return value
-    try:
-        value = value_type(value)
-    except (ValueError, TypeError) as error:
+        if value_type is None:
+            raise TypeError("'{}' is not a type name".format(name))
+    with _type_cache_lock:
+        converter = _converter_cache.get(value_type)
+        if converter is not None:
+            _converter_cache.move_to_end(value_type)
+            return converter
+
+    def convert_failed(value, error):
         logging.warning(
             "convert '{}' to type '{}' failed, set to 'None', {}: {}".format(
                 value, value_type.__name__, error.__class__.__name__, error))
-        value = None
-    finally:
-        return value
+        return None
+
+    if value_type in (int, float, str, list, dict):
+        def converter(value):
+            if value.__class__ is value_type:
+                return value
+            if isinstance(value, value_type):
+                return value
+            try:
+                return value_type(value)
+            except (ValueError, TypeError, OverflowError) as error:
+                return convert_failed(value, error)
+    elif value_type is bool:
+        def converter(value):
+            if value is True or value is False:
+                return value
+            try:
+                return bool(value)
+            except (ValueError, TypeError) as error:
+                return convert_failed(value, error)
+    else:
+        def converter(value):
+            if isinstance(value, value_type):
+                return value
+            try:
+                return value_type(value)
+            except (ValueError, TypeError, OverflowError) as error:
+                return convert_failed(value, error)
+
+    with _type_cache_lock:
+        _converter_cache[value_type] = converter
+        while len(_converter_cache) > CONVERTER_CACHE_SIZE:
+            _converter_cache.popitem(last=False)
+    return converter
+
+
+def convert_type(value, value_type):
+    return compile_converter(value_type)(value)
 
 
-def load_yaml(contents=[], filenames=[]):
+def load_yaml(contents=[], filenames=[], pickname=None):
+    names = picknames(pickname)
+
     def load_content(content):
-        for item in yaml.load_all(content):
+        if names:
+            for item in pick_yaml(content, names):
+                yield item
+            return
+        for item in yaml.load_all(content, Loader=YAML_LOADER):
             if item is not None:
                 yield item
 
@@ -93,6 +230,133 @@ def load_yaml(contents=[], filenames=[]):
                 yield item
 
 
+_MISSING = object()
+YAML_MERGE_TAG = "tag:yaml.org,2002:merge"
+
+
+def pick_yaml(stream, pickname):
+    names = picknames(pickname)
+    loader = YAML_LOADER(stream)
+    try:
+        loader.get_event()
+        while not loader.check_event(yaml.StreamEndEvent):
+            loader.get_event()
+            anchors = {}
+            if loader.check_event(yaml.ScalarEvent):
+                item = loader.construct_document(
+                    compose_yaml_node(loader, anchors))
+                if item is not None:
+                    yield {}
+            else:
+                item = pick_yaml_node(loader, names, anchors)
+                yield item if isinstance(item, dict) else {}
+            loader.get_event()
+    finally:
+        loader.dispose()
+
+
+def pick_yaml_node(loader, names, anchors):
+    if not names:
+        return loader.construct_document(compose_yaml_node(loader, anchors))
+    event = loader.peek_event()
+    if ((not isinstance(event, yaml.MappingStartEvent))
+            or (event.anchor is not None)
+            or (event.tag not in (None, "!", "tag:yaml.org,2002:map"))):
+        return pick_data(
+            loader.construct_document(compose_yaml_node(loader, anchors)),
+            names)
+    loader.get_event()
+    result = _MISSING
+    merges = []
+    while not loader.check_event(yaml.MappingEndEvent):
+        key_node = compose_yaml_node(loader, anchors)
+        if key_node.tag == YAML_MERGE_TAG:
+            merges.append(compose_yaml_node(loader, anchors))
+            continue
+        key = (key_node.value if key_node.tag == "tag:yaml.org,2002:str"
+               else loader.construct_document(key_node))
+        if key == names[0]:
+            result = pick_yaml_node(loader, names[1:], anchors)
+        else:
+            skip_yaml_node(loader, anchors)
+    loader.get_event()
+    if result is not _MISSING:
+        return result
+    for node in merges:
+        merge = loader.construct_document(node)
+        for item in (merge if isinstance(merge, list) else [merge]):
+            result = pick_data(item, names)
+            if result is not _MISSING:
+                return result
+    return _MISSING
+
+
+def pick_data(data, names):
+    for name in names:
+        if (not isinstance(data, dict)) or (name not in data):
+            return _MISSING
+        data = data[name]
+    return data
+
+
+def skip_yaml_node(loader, anchors):
+    event = loader.peek_event()
+    if ((not isinstance(event, yaml.AliasEvent))
+            and (event.anchor is not None)):
+        compose_yaml_node(loader, anchors)
+        return
+    loader.get_event()
+    if isinstance(event, (yaml.SequenceStartEvent, yaml.MappingStartEvent)):
+        while not loader.check_event(yaml.SequenceEndEvent,
+                                     yaml.MappingEndEvent):
+            skip_yaml_node(loader, anchors)
+        loader.get_event()
+
+
+def compose_yaml_node(loader, anchors):
+    event = loader.get_event()
+    if isinstance(event, yaml.AliasEvent):
+        if event.anchor not in anchors:
+            raise yaml.composer.ComposerError(
+                None, None, "found undefined alias '{}'".format(event.anchor),
+                event.start_mark)
+        return anchors[event.anchor]
+    tag = event.tag
+    if isinstance(event, yaml.ScalarEvent):
+        if tag is None or tag == "!":
+            tag = loader.resolve(yaml.ScalarNode, event.value, event.implicit)
+        node = yaml.ScalarNode(
+            tag,
+            event.value,
+            event.start_mark,
+            event.end_mark,
+            style=event.style)
+        if event.anchor is not None:
+            anchors[event.anchor] = node
+        return node
+    if isinstance(event, yaml.SequenceStartEvent):
+        if tag is None or tag == "!":
+            tag = loader.resolve(yaml.SequenceNode, None, event.implicit)
+        node = yaml.SequenceNode(
+            tag, [], event.start_mark, None, flow_style=event.flow_style)
+        if event.anchor is not None:
+            anchors[event.anchor] = node
+        while not loader.check_event(yaml.SequenceEndEvent):
+            node.value.append(compose_yaml_node(loader, anchors))
+    else:
+        if tag is None or tag == "!":
+            tag = loader.resolve(yaml.MappingNode, None, event.implicit)
+        node = yaml.MappingNode(
+            tag, [], event.start_mark, None, flow_style=event.flow_style)
+        if event.anchor is not None:
+            anchors[event.anchor] = node
+        while not loader.check_event(yaml.MappingEndEvent):
+            key = compose_yaml_node(loader, anchors)
+            node.value.append((key, compose_yaml_node(loader, anchors)))
+    node.end_mark = loader.get_event().end_mark
+    return node
+
+
 def dump_yaml(data, filename=""):
     if isinstance(data, list):
         dump = yaml.dump_all
@@ -100,6 +364,7 @@ def dump_yaml(data, filename=""):
         dump = yaml.dump
     output = dump(
         data,
+        Dumper=YAML_DUMPER,
         default_style="",
         canonical=False,
         indent=2,
@@ -113,7 +378,9 @@ def dump_yaml(data, filename=""):
     return output
 
 
-def load_json(contents=[], filenames=[]):
+def load_json(contents=[], filenames=[], pickname=None):
+    names = picknames(pickname)
+
     def load_content(content):
         json = JSON.loads(content)
         if not isinstance(json, list):
@@ -121,6 +388,14 @@ def load_json(contents=[], filenames=[]):
         for item in json:
             yield item
 
+    def pick_content(items):
+        for item in items:
+            if names:
+                item = pick_data(item, names)
+                yield item if isinstance(item, dict) else {}
+            else:
+                yield item
+
     if isinstance(contents, str):
         contents = [contents]
     elif contents is None:
@@ -132,14 +407,96 @@ def load_json(contents=[], filenames=[]):
         filenames = []
 
     for content in contents:
-        for item in load_content(content):
+        for item in pick_content(load_content(content)):
             yield item
     for filename in filenames:
         with open(os.path.expanduser(os.path.expandvars(filename)),
                   "r") as stream:
-            content = stream.read()
-        for item in load_content(content):
+            for item in pick_content(iter_json(stream)):
+                yield item
+
+
+JSON_CHUNK_SIZE = 1 << 16
+
+
+def iter_json(stream, chunk_size=JSON_CHUNK_SIZE):
+    first = stream.read(1)
+    while first.isspace():
+        first = stream.read(1)
+    if not first:
+        return
+    if first == "[":
+        for item in iter_json_array(stream, chunk_size):
+            yield item
+        return
+    decoder = JSON.JSONDecoder()
+    line = first + stream.readline()
+    while True:
+        text = line.strip()
+        if text:
+            try:
+                item, end = decoder.raw_decode(text)
+            except JSON.JSONDecodeError:
+                break
+            if end != len(text):
+                break
             yield item
+        line = stream.readline()
+        if not line:
+            return
+    for item in iter_json_text(line + stream.read(), decoder):
+        yield item
+
+
+def iter_json_text(text, decoder):
+    position = 0
+    while True:
+        while position < len(text) and text[position].isspace():
+            position += 1
+        if position >= len(text):
+            break
+        item, position = decoder.raw_decode(text, position)
+        yield item
+
+
+def iter_json_array(stream, chunk_size=JSON_CHUNK_SIZE):
+    decoder = JSON.JSONDecoder()
+    buffer = ""
+    position = 0
+    eof = False
+    size = chunk_size
+    while True:
+        while position < len(buffer) and buffer[position].isspace():
+            position += 1
+        if position < len(buffer) and buffer[position] == ",":
+            position += 1
+            continue
+        if position >= len(buffer):
+            if eof:
+                raise JSON.JSONDecodeError("Expecting ']'", buffer, position)
+            chunk = stream.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+            continue
+        if buffer[position] == "]":
+            break
+        try:
+            item, end = decoder.raw_decode(buffer, position)
+        except JSON.JSONDecodeError:
+            if eof:
+                raise
+            end = None
+        if end is None or (end >= len(buffer) and not eof):
+            chunk = stream.read(size)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+            size *= 2
+            continue
+        yield item
+        position = end
+        size = chunk_size
 
 
 def dump_json(json, filename=None):
@@ -155,18 +512,22 @@ def detect_filetype(filename):
     return filename[filename.rfind(".") + 1:].lower()
 
 
-def load_config(filename):
+def load_config(filename, pickname=None, cache=None):
     if isinstance(filename, list) or isinstance(filename, tuple):
         for filename_i in filename:
-            for _, item in enumerate(load_config(filename_i)):
+            for _, item in enumerate(
+                    load_config(filename_i, pickname, cache=cache)):
                 yield item
+    elif cache is not None:
+        for item in cache.load(filename, pickname=pickname):
+            yield item
     else:
         filetype = detect_filetype(filename)
         if filetype == "json":
-            for item in load_json(filenames=filename):
+            for item in load_json(filenames=filename, pickname=pickname):
                 yield item
         elif filetype == "yaml":
-            for item in load_yaml(filenames=filename):
+            for item in load_yaml(filenames=filename, pickname=pickname):
                 yield item
 
 
@@ -0,0 +1,232 @@
+from .options import Options, VIOLATION_MESSAGES
+from .utils import locate_type
+import collections
+import weakref
+
+Violation = collections.namedtuple("Violation", ["path", "kind", "message"])
+
+CONSTRAINT_NAMES = ("type", "required", "min", "max")
+
+
+class ValidationReport():
+    def __init__(self, violations=[]):
+        self.violations = list(violations)
+
+    def __len__(self):
+        return len(self.violations)
+
+    def __iter__(self):
+        return iter(self.violations)
+
+    def __repr__(self):
+        return str(self.values())
+
+    def isvalid(self):
+        return len(self.violations) == 0
+
+    def paths(self):
+        result = []
+        for violation in self.violations:
+            if violation.path not in result:
+                result.append(violation.path)
+        return result
+
+    def messages(self):
+        return [
+            "{}: {}".format(violation.path, violation.message)
+            if violation.path else violation.message
+            for violation in self.violations
+        ]
+
+    def values(self):
+        return [violation._asdict() for violation in self.violations]
+
+    def check(self):
+        if self.violations:
+            raise AssertionError("\n".join(self.messages()))
+
+
+def bound_violations(path, value, minimum, maximum):
+    violations = []
+    for kind, bound in (("min", minimum), ("max", maximum)):
+        if bound is None:
+            continue
+        try:
+            valid = value >= bound if kind == "min" else value <= bound
+        except TypeError:
+            valid = False
+        if not valid:
+            violations.append(
+                Violation(path, kind, VIOLATION_MESSAGES[kind].format(
+                    Options.__name__, value, bound)))
+    return violations
+
+
+def weak_watcher(method):
+    reference = weakref.WeakMethod(method)
+
+    def watcher(options, name, old):
+        method = reference()
+        if method is not None:
+            method(options, name, old)
+
+    return watcher
+
+
+def unwatch(leaves, watcher):
+    for attr in leaves:
+        attr.unwatch(watcher)
+
+
+class ValidationPlan():
+    def __init__(self, config, version=None):
+        self.version = version
+        self.leaves = {}
+        self.order = {}
+        self.required = []
+        self.bounds = []
+        self.located = {}
+        types = {}
+        for path, attr in config.path_index().items():
+            if not isinstance(attr, Options):
+                continue
+            self.order[path] = len(self.order)
+            self.leaves[path] = (attr, attr.type, attr.required, attr.min,
+                                 attr.max)
+            if attr.required:
+                self.required.append((path, attr))
+            if attr.type is not None:
+                types.setdefault(attr.type, []).append((path, attr))
+            if attr.min is not None or attr.max is not None:
+                self.bounds.append((path, attr, attr.min, attr.max))
+        self.types = []
+        for name, entries in types.items():
+            try:
+                self.located[name] = locate_type(name)
+            except NameError:
+                self.located[name] = None
+            self.types.append((name, self.located[name], entries))
+        self.paths = None
+        self.results = None
+        self.dirty = set()
+        self.stale = False
+        self.attach()
+
+    def run(self):
+        violations = []
+        message = VIOLATION_MESSAGES["required"].format(Options.__name__)
+        violations.extend(
+            Violation(path, "required", message)
+            for path, attr in self.required if attr.value is None)
+        message = VIOLATION_MESSAGES["type"]
+        for name, value_type, entries in self.types:
+            if value_type is None:
+                violations.extend(
+                    Violation(path, "type", "type '{}' not found".format(name))
+                    for path, _ in entries)
+                continue
+            violations.extend(
+                Violation(path, "type",
+                          message.format(Options.__name__, attr.value, name))
+                for path, attr in entries
+                if not isinstance(attr.value, value_type))
+        for path, attr, minimum, maximum in self.bounds:
+            if attr.value is not None:
+                violations.extend(
+                    bound_violations(path, attr.value, minimum, maximum))
+        order = self.order
+        violations.sort(key=lambda violation: order[violation.path])
+        if self.paths is not None:
+            self.results = {}
+            for violation in violations:
+                self.results.setdefault(violation.path, []).append(violation)
+            self.dirty = set()
+        return ValidationReport(violations)
+
+    def check(self, path):
+        attr, name, required, minimum, maximum = self.leaves[path]
+        value = attr.value
+        violations = []
+        if required and value is None:
+            violations.append(
+                Violation(path, "required",
+                          VIOLATION_MESSAGES["required"].format(
+                              Options.__name__)))
+        if name is not None:
+            value_type = self.located[name]
+            if value_type is None:
+                violations.append(
+                    Violation(path, "type",
+                              "type '{}' not found".format(name)))
+            elif not isinstance(value, value_type):
+                violations.append(
+                    Violation(path, "type", VIOLATION_MESSAGES["type"].format(
+                        Options.__name__, value, name)))
+        if value is not None:
+            violations.extend(bound_violations(path, value, minimum, maximum))
+        return violations
+
+    def revalidate(self):
+        if self.results is None:
+            return self.run()
+        dirty, self.dirty = self.dirty, set()
+        for path in dirty:
+            violations = self.check(path)
+            if violations:
+                self.results[path] = violations
+            else:
+                self.results.pop(path, None)
+        return self.report()
+
+    def report(self):
+        order = self.order
+        violations = []
+        for path in sorted(self.results, key=lambda path: order[path]):
+            violations.extend(self.results[path])
+        return ValidationReport(violations)
+
+    def attach(self):
+        if self.paths is not None:
+            return
+        self.paths = {}
+        leaves = []
+        for path, (attr, *_) in self.leaves.items():
+            self.paths[id(attr)] = path
+            leaves.append(attr)
+        self.watcher = weak_watcher(self.record)
+        for attr in leaves:
+            attr.watch(self.watcher)
+        self.finalizer = weakref.finalize(self, unwatch, leaves, self.watcher)
+
+    def detach(self):
+        if self.paths is None:
+            return
+        self.finalizer()
+        self.paths = None
+
+    def close(self):
+        self.detach()
+
+    def record(self, options, name, old):
+        if name == "value":
+            self.dirty.add(self.paths[id(options)])
+        elif name in CONSTRAINT_NAMES:
+            self.stale = True
+
+    def inherit(self, plan, changes=None):
+        if changes is None:
+            plan.detach()
+        if plan.results is None:
+            return
+        self.results = {}
+        for path, leaf in self.leaves.items():
+            previous = plan.leaves.get(path)
+            if changes is None:
+                moved = previous is not None and previous[0] is not leaf[0]
+            else:
+                moved = path in changes
+            if (previous is None or moved or previous[1:] != leaf[1:]
+                    or path in plan.dirty):
+                self.dirty.add(path)
+            elif path in plan.results:
+                self.results[path] = plan.results[path]
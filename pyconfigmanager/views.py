@@ -0,0 +1,116 @@
+from .options import Options
+from .utils import locate_type
+import collections
+import operator
+
+
+class ConfigAccessor():
+    __slots__ = ()
+
+    def __repr__(self):
+        return str(accessor_values(self))
+
+
+_accessor_classes = {}
+_accessor_fields = {}
+
+
+def leaf_setter(slot):
+    getter = operator.attrgetter(slot)
+
+    def setter(self, value):
+        getter(self).value = value
+
+    return setter
+
+
+def accessor_class(names, leaves):
+    key = (names, leaves)
+    view_class = _accessor_classes.get(key)
+    if view_class is None:
+        namespace = {}
+        fields = []
+        for index, (name, leaf) in enumerate(zip(names, leaves)):
+            slot = "_{}".format(index)
+            while slot in names:
+                slot = slot + "_"
+            fields.append((name, slot, leaf))
+            if leaf:
+                namespace[name] = property(
+                    operator.attrgetter(slot + ".value"), leaf_setter(slot))
+            else:
+                namespace[name] = property(operator.attrgetter(slot))
+        namespace["__slots__"] = tuple(slot for _, slot, _ in fields)
+        namespace["__module__"] = __name__
+        view_class = type(ConfigAccessor.__name__, (ConfigAccessor, ),
+                          namespace)
+        _accessor_classes[key] = view_class
+        _accessor_fields[view_class] = tuple(fields)
+    return view_class
+
+
+def build_accessor(config):
+    items = config.items(raw=True)
+    accessor_type = accessor_class(
+        tuple(name for name, _ in items),
+        tuple(isinstance(attr, Options) for _, attr in items))
+    accessor = object.__new__(accessor_type)
+    for (_, slot, leaf), (_, attr) in zip(_accessor_fields[accessor_type],
+                                          items):
+        setattr(accessor, slot, attr if leaf else build_accessor(attr))
+    return accessor
+
+
+def accessor_values(accessor):
+    result = {}
+    for name, slot, leaf in _accessor_fields[type(accessor)]:
+        attr = getattr(accessor, slot)
+        result[name] = attr.value if leaf else accessor_values(attr)
+    return result
+
+
+_namedtuple_classes = {}
+
+
+def field_annotation(kind):
+    if isinstance(kind, tuple):
+        return namedtuple_class(kind)
+    if kind is None:
+        return object
+    try:
+        return locate_type(kind)
+    except NameError:
+        return kind
+
+
+def namedtuple_class(shape):
+    view_class = _namedtuple_classes.get(shape)
+    if view_class is None:
+        view_class = collections.namedtuple(
+            "ConfigTuple", [name for name, _ in shape], rename=True)
+        view_class.__annotations__ = {
+            field: field_annotation(kind)
+            for field, (_, kind) in zip(view_class._fields, shape)
+        }
+        view_class.__module__ = __name__
+        _namedtuple_classes[shape] = view_class
+    return view_class
+
+
+def materialize(config):
+    shape = []
+    values = []
+    for name, attr in config.items(raw=True):
+        if isinstance(attr, Options):
+            shape.append((name, attr.type))
+            values.append(attr.value)
+        else:
+            kind, value = materialize(attr)
+            shape.append((name, kind))
+            values.append(value)
+    shape = tuple(shape)
+    return shape, namedtuple_class(shape)._make(values)
+
+
+def build_namedtuple(config):
+    return materialize(config)[1]
@@ -48,6 +48,9 @@ setup(
         'Programming Language :: Python :: 3.5',
     ],
     scripts=get_scripts(),
+    entry_points={
+        "console_scripts": ["pyconfigmanager=pyconfigmanager.cli:main"],
+    },
     ext_modules=[],
     package_data={
         package_name: ["*.yaml", "*.json", "**/*.yaml", "**/*.json"]